@@ -1,15 +1,81 @@
-from fastapi import FastAPI
-from pydantic import BaseModel
-from bot_flow import greet_user, handle_symptoms
-from recommend_doctors import recommend_doctors
-from geocode_utils import geocode_location
+import os
+import hmac
+import time
+import threading
+from datetime import datetime
+from typing import List, Optional, Union
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
+from pydantic import BaseModel, Field, field_validator
+from bot_flow import greet_user, symptoms_response
+from recommend_doctors import recommend_doctors, doctor_data, reload_doctor_data, DOCTOR_CSV
+from predict_specialist import predict_specialist_async, specialist_cache, ml_model, tfidf_model
+from specialist_rules import rule_table
+from gazetteer import gazetteer
+from geocode_utils import geocode_location_async, geocode_cache, close_async_client
+from cpu_executor import cpu_executor, ExecutorSaturated
+from lazy_resource import READY, UNAVAILABLE
+from result_cache import recommend_cache, make_key
+from availability import LOCAL_TZ, week_slot
+from ranking import DEFAULT_RANKING, check_profile
+import metrics
+from metrics import stage_seconds, empty_results, should_profile, profiled
+from file_watcher import FileWatcher
+
+# Load doctor index, gazetteer and ML models in the background at startup
+# (otherwise each loads on first use)
+WARMUP_ON_STARTUP = True
+
+# Reload the doctor directory when the CSV changes (polled every N seconds)
+WATCH_DOCTOR_CSV = True
+DOCTOR_WATCH_INTERVAL = 30
+
+doctor_watcher = FileWatcher(DOCTOR_CSV, reload_doctor_data, interval=DOCTOR_WATCH_INTERVAL)
+
+# POST /admin/reload-doctors needs "X-Admin-Token: <ADMIN_TOKEN>";
+# unset = endpoint disabled (the watcher above still reloads)
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+
+
+def warm_up():
+    for resource in (doctor_data, gazetteer, tfidf_model, ml_model):
+        try:
+            resource.get()
+        except Exception as e:
+            print(f"⚠️ Warm-up failed for {resource.name}:", e)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    if WARMUP_ON_STARTUP:
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    if WATCH_DOCTOR_CSV:
+        doctor_watcher.start()
+    yield
+    doctor_watcher.stop()
+    await close_async_client()
+
 
 app = FastAPI(
     title="AI Medical Assistant Bot",
     description="Symptom-based doctor recommendation system",
-    version="1.0"
+    version="1.0",
+    lifespan=lifespan
 )
 
+
+@app.exception_handler(ExecutorSaturated)
+async def executor_saturated(request, exc):
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": "1"},
+        content={
+            "message": "The assistant is busy right now. Please try again in a moment.",
+            "next_actions": ["retry"]
+        }
+    )
+
 # =========================
 # Request Models
 # =========================
@@ -24,6 +90,19 @@ class FilterRequest(BaseModel):
     max_distance_km: int    # 3 / 5 / etc.
     max_fees: int
     min_rating: float
+    limit: Optional[int] = Field(None, ge=1, le=100)    # page size, None = every match
+    offset: int = Field(0, ge=0)
+    open_now: bool = False                  # only doctors open right now
+    open_at: Optional[datetime] = None      # ... or at this time (naive = India time)
+    # "candidates" from the /symptoms response: skips re-classifying
+    specialist: Optional[Union[str, List[str]]] = None
+    ranking: str = DEFAULT_RANKING          # profile in ranking.RANKING_PROFILES
+
+    @field_validator("ranking")
+    @classmethod
+    def known_profile(cls, value):
+        return check_profile(value)
+
 
 
 # =========================
@@ -31,7 +110,7 @@ class FilterRequest(BaseModel):
 # =========================
 
 @app.get("/greet")
-def greet():
+async def greet():
     """
     Bot greeting based on time
     """
@@ -42,21 +121,77 @@ def greet():
 
 
 @app.post("/symptoms")
-def process_symptoms(data: SymptomRequest):
+async def process_symptoms(data: SymptomRequest):
     """
     Takes symptoms and predicts specialist
     """
-    specialist, response = handle_symptoms(data.symptoms)
+    prediction = await predict_specialist_async(data.symptoms)
+    response = symptoms_response(prediction)
 
     return {
-        "specialist": specialist,
+        "specialist": prediction.specialist,
+        "confidence": prediction.confidence,
+        "candidates": list(prediction.candidates),
         "message": f"{response} Please enter your location so I can find nearby doctors.",
         "next_actions": ["enter_location"]
     }
 
 
+def find_doctors(specialist, lat, lng, data, open_at=None, profile=False):
+    """
+    Runs the recommendation engine for one page;
+    returns (used_radius, doctors list, total matches)
+    """
+    with profiled(profile):
+        return _find_doctors(specialist, lat, lng, data, open_at)
+
+
+def _find_doctors(specialist, lat, lng, data, open_at):
+    results = recommend_doctors(
+        symptoms_text=data.symptoms,
+        patient_lat=lat,
+        patient_lng=lng,
+        location_text=data.location_text,
+        max_distance_km=data.max_distance_km,
+        max_fees=data.max_fees,
+        min_rating=data.min_rating,
+        specialist=specialist,
+        limit=data.limit,
+        offset=data.offset,
+        open_at=open_at,
+        ranking=data.ranking
+    )
+
+    total = results.attrs.get("total_matches", 0)
+    if results.empty:
+        return None, [], total
+
+    # Read auto-expanded radius (if applied)
+    used_radius = None
+    if "used_radius_km" in results.columns:
+        used_radius = int(results["used_radius_km"].iloc[0])
+
+    # Prepare response doctors list
+    with stage_seconds.time("serialize"):
+        doctors = results[
+            [
+                "doctor_name",
+                "speciality",
+                "area",
+                "distance_km",
+                "rating",
+                "fees",
+                "contact",
+                "address",
+                "availability_text"
+            ] + (["score"] if "score" in results.columns else [])
+        ].to_dict(orient="records")
+
+    return used_radius, doctors, total
+
+
 @app.post("/recommend")
-def recommend(data: FilterRequest):
+async def recommend(data: FilterRequest, x_profile: Optional[str] = Header(None)):
     """
     Recommends doctors based on:
     - symptoms
@@ -64,59 +199,68 @@ def recommend(data: FilterRequest):
     - distance (auto-expand)
     - fees
     - rating
+    ("X-Profile: 1" writes a cProfile dump of the engine call, if
+    metrics.PROFILE_HEADER_ENABLED)
     """
 
+    start = time.perf_counter()
+
     # 1️⃣ Convert location text → latitude & longitude
-    lat, lng = geocode_location(data.location_text)
+    with stage_seconds.time("geocode"):
+        lat, lng = await geocode_location_async(data.location_text)
 
     if lat is None or lng is None:
+        empty_results.inc("unknown_location")
         return {
             "message": "I couldn’t understand the location you entered. Please try entering a nearby area or locality.",
             "doctors": [],
             "next_actions": ["reenter_location"]
         }
 
-    # 2️⃣ Call recommendation engine
-    results = recommend_doctors(
-        symptoms_text=data.symptoms,
-        patient_lat=lat,
-        patient_lng=lng,
-        location_text=data.location_text,
-        max_distance_km=data.max_distance_km,
-        max_fees=data.max_fees,
-        min_rating=data.min_rating
+    # 2️⃣ Predict specialist (unless /symptoms already did), then serve
+    # from cache or call the engine
+    specialist = data.specialist
+    if not specialist:
+        prediction = await predict_specialist_async(data.symptoms)
+        specialist = list(prediction.candidates)
+
+    open_at = datetime.now(LOCAL_TZ) if data.open_now else data.open_at
+
+    key = make_key(
+        specialist, lat, lng, data.location_text,
+        data.max_distance_km, data.max_fees, data.min_rating,
+        data.limit, data.offset,
+        week_slot(open_at) if open_at is not None else None,
+        data.ranking
     )
+    cached = recommend_cache.get(key)
 
-    if results.empty:
+    if cached is None:
+        generation = recommend_cache.generation
+        profile = should_profile(x_profile == "1")
+        cached = await cpu_executor.run(find_doctors, specialist, lat, lng, data, open_at, profile)
+        recommend_cache.set(key, cached, generation=generation)
+        cache_hit = False
+    else:
+        cache_hit = True
+
+    used_radius, doctors, total = cached
+    elapsed = time.perf_counter() - start
+    recommend_cache.record_latency(cache_hit, elapsed)
+    stage_seconds.observe(elapsed, "total_cache_hit" if cache_hit else "total")
+
+    if not doctors:
         return {
             "message": (
                 "I couldn’t find doctors matching your preferences nearby. "
                 "You may try increasing the distance or adjusting filters."
             ),
             "doctors": [],
+            "total_matches": total,
             "next_actions": ["change_filters", "search_another_symptom"]
         }
 
-    # 3️⃣ Read auto-expanded radius (if applied)
-    used_radius = None
-    if "used_radius_km" in results.columns:
-        used_radius = int(results["used_radius_km"].iloc[0])
-
-    # 4️⃣ Prepare response doctors list
-    doctors = results[
-        [
-            "doctor_name",
-            "area",
-            "distance_km",
-            "rating",
-            "fees",
-            "contact",
-            "address",
-            "availability_text"
-        ]
-    ].to_dict(orient="records")
-
-    # 5️⃣ Dynamic, user-friendly message
+    # 3️⃣ Dynamic, user-friendly message
     if used_radius:
         message = (
             f"Here are the best doctors found within {used_radius} km of "
@@ -131,9 +275,15 @@ def recommend(data: FilterRequest):
             "location": data.location_text,
             "max_distance_km": used_radius,
             "max_fees": data.max_fees,
-            "min_rating": data.min_rating
+            "min_rating": data.min_rating,
+            "open_at": open_at.isoformat() if open_at is not None else None,
+            "ranking": data.ranking
         },
         "doctors": doctors,
+        "total_matches": total,
+        "limit": data.limit,
+        "offset": data.offset,
+        "next_offset": data.offset + len(doctors) if data.offset + len(doctors) < total else None,
         "next_actions": [
             "change_filters",
             "search_another_symptom"
@@ -141,8 +291,84 @@ def recommend(data: FilterRequest):
     }
 
 
+@app.get("/ready")
+async def ready():
+    """
+    Readiness of each component. 503 until the required ones are loaded;
+    the ML models are optional (rules + default cover their absence).
+    """
+    components = {
+        "rules": {"state": READY, "rules": len(rule_table.specialists)},
+        "tfidf_model": tfidf_model.status(),
+        "model": ml_model.status(),
+        "doctor_index": doctor_data.status(),
+        "geocoder": {**gazetteer.status(), "cache": geocode_cache.stats()}
+    }
+
+    is_ready = (
+        components["doctor_index"]["state"] == READY and
+        components["geocoder"]["state"] == READY and
+        components["tfidf_model"]["state"] in (READY, UNAVAILABLE) and
+        components["model"]["state"] in (READY, UNAVAILABLE)
+    )
+
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={"ready": is_ready, "components": components}
+    )
+
+
+@app.get("/stats")
+async def stats():
+    """
+    Cache hit rates and latency
+    """
+    return {
+        "recommend_cache": recommend_cache.stats(),
+        "geocode_cache": geocode_cache.stats(),
+        "specialist_cache": specialist_cache.stats(),
+        "cpu_executor": cpu_executor.stats(),
+        "doctor_watcher": doctor_watcher.stats()
+    }
+
+
+@app.post("/admin/reload-doctors")
+async def reload_doctors(x_admin_token: Optional[str] = Header(None)):
+    """
+    Re-reads the doctor directory and swaps it in (in-flight requests
+    finish on the old one). Only with the ADMIN_TOKEN.
+    """
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    return await cpu_executor.run(reload_doctor_data)
+
+
+cache_gauges = [
+    metrics.Gauge("recommend_cache_hits", "/recommend cache hits", lambda: recommend_cache.hits),
+    metrics.Gauge("recommend_cache_misses", "/recommend cache misses", lambda: recommend_cache.misses),
+    metrics.Gauge("recommend_cache_entries", "/recommend cache entries", lambda: len(recommend_cache)),
+    metrics.Gauge("geocode_cache_hits", "Geocode cache hits (memory + disk)",
+                  lambda: geocode_cache.hits_memory + geocode_cache.hits_disk),
+    metrics.Gauge("geocode_cache_misses", "Geocode cache misses", lambda: geocode_cache.misses),
+    metrics.Gauge("specialist_cache_hits", "Specialist prediction cache hits", lambda: specialist_cache.hits),
+    metrics.Gauge("specialist_cache_misses", "Specialist prediction cache misses", lambda: specialist_cache.misses),
+    metrics.Gauge("cpu_executor_in_flight", "Tasks running or queued on the CPU executor", lambda: cpu_executor.in_flight),
+    metrics.Gauge("cpu_executor_rejected", "Tasks rejected with 503", lambda: cpu_executor.rejected),
+]
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """
+    Stage latency histograms and counters (Prometheus text format)
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.post("/reset")
-def reset():
+async def reset():
     """
     Resets the conversation flow
     """
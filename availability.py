@@ -0,0 +1,173 @@
+import re
+from zoneinfo import ZoneInfo
+import numpy as np
+
+# =========================
+# Weekly availability schedules
+# =========================
+# "Mon–Sat | 9:30 AM – 1:30 PM, 4:30 PM – 7:30 PM" is compiled once
+# into a week of 15-minute slots (7 × 96 bits, packed into 84 bytes).
+# An "open at" query is then one bit test per doctor.
+#
+# Grammar (case-insensitive, "–" / "—" / "to" accepted for "-"):
+#   schedule := group (";" group)*
+#   group    := days "|" times
+#   days     := "daily" | "all days" | day ["-" day] ("," day ["-" day])*
+#   times    := "24 hours" | "24x7" | time "-" time ("," time "-" time)*
+#   time     := H[:MM] am|pm | HH:MM (24 h) | "noon" | "midnight"
+# A range ending at or before its start runs past midnight.
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES       # 96
+SLOTS_PER_WEEK = 7 * SLOTS_PER_DAY            # 672
+SCHEDULE_BYTES = SLOTS_PER_WEEK // 8          # 84
+
+LOCAL_TZ = ZoneInfo("Asia/Kolkata")           # naive datetimes are local time
+
+DAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+_DAY_NAMES = {
+    **{d: i for i, d in enumerate(DAYS)},
+    "tues": 1, "thur": 3, "thurs": 3,
+    "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
+    "friday": 4, "saturday": 5, "sunday": 6
+}
+_ALL_DAYS = {"daily", "all days", "everyday", "every day", "all week", "mon-sun"}
+_ALL_HOURS = {"24 hours", "24 hrs", "24x7", "24/7", "open 24 hours"}
+
+_TIME_RE = re.compile(r"^(?:(\d{1,2})(?::(\d{2}))?\s*([ap])\.?\s*m\.?|(\d{1,2}):(\d{2})|noon|midnight)$")
+
+
+def _normalize(text):
+    text = text.lower().replace("–", "-").replace("—", "-")
+    text = re.sub(r"\s+to\s+", "-", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _parse_days(spec):
+    if spec in _ALL_DAYS:
+        return list(range(7))
+
+    days = []
+    for part in re.split(r"\s*[,&/]\s*", spec):
+        ends = [p.strip().rstrip(".") for p in part.split("-")]
+        if len(ends) > 2 or any(e not in _DAY_NAMES for e in ends):
+            raise ValueError(f"unknown days {part!r}")
+        first, last = _DAY_NAMES[ends[0]], _DAY_NAMES[ends[-1]]
+        # "Fri-Mon" wraps over the weekend
+        days.extend((first + i) % 7 for i in range((last - first) % 7 + 1))
+    return days
+
+
+def _parse_time(spec):
+    """
+    Minutes after midnight
+    """
+    spec = spec.strip()
+    m = _TIME_RE.match(spec)
+    if not m:
+        raise ValueError(f"bad time {spec!r}")
+    if spec == "noon":
+        return 12 * 60
+    if spec == "midnight":
+        return 0
+
+    if m.group(3):
+        hour, minute = int(m.group(1)), int(m.group(2) or 0)
+        if not 1 <= hour <= 12:
+            raise ValueError(f"bad time {spec!r}")
+        hour = hour % 12 + (12 if m.group(3) == "p" else 0)
+    else:
+        hour, minute = int(m.group(4)), int(m.group(5))
+        if hour > 23:
+            raise ValueError(f"bad time {spec!r}")
+
+    if minute > 59:
+        raise ValueError(f"bad time {spec!r}")
+    return hour * 60 + minute
+
+
+def _parse_ranges(spec):
+    """
+    [(start_slot, end_slot)] within a day; end may exceed SLOTS_PER_DAY
+    """
+    if spec in _ALL_HOURS:
+        return [(0, SLOTS_PER_DAY)]
+
+    ranges = []
+    for part in spec.split(","):
+        ends = part.split("-")
+        if len(ends) != 2:
+            raise ValueError(f"bad time range {part.strip()!r}")
+        start, end = _parse_time(ends[0]), _parse_time(ends[1])
+        if end <= start:
+            end += 24 * 60
+        # only slots entirely inside the range count as open
+        ranges.append((-(-start // SLOT_MINUTES), end // SLOT_MINUTES))
+    return ranges
+
+
+def parse_schedule(text):
+    """
+    Packed weekly bitmap (SCHEDULE_BYTES uint8) for one availability
+    string; raises ValueError if it cannot be parsed
+    """
+    week = np.zeros(SLOTS_PER_WEEK, dtype=bool)
+
+    groups = [g for g in re.split(r"[;\n]", _normalize(text)) if g.strip()]
+    if not groups:
+        raise ValueError("empty schedule")
+
+    for group in groups:
+        if "|" not in group:
+            raise ValueError(f"expected 'days | hours' in {group.strip()!r}")
+        days, times = (p.strip() for p in group.split("|", 1))
+
+        ranges = _parse_ranges(times)
+        for day in _parse_days(days):
+            for start, end in ranges:
+                slots = np.arange(start, end) + day * SLOTS_PER_DAY
+                week[slots % SLOTS_PER_WEEK] = True
+
+    return np.packbits(week)
+
+
+def compile_schedules(texts):
+    """
+    Bitmaps for a sequence of (distinct) availability strings.
+    Returns (uint8 array of shape (len(texts), SCHEDULE_BYTES),
+    {text: error} for the ones that could not be parsed).
+    Missing values get an empty schedule and are not reported.
+    """
+    bitmaps = np.zeros((len(texts), SCHEDULE_BYTES), dtype=np.uint8)
+    errors = {}
+    for i, text in enumerate(texts):
+        if not isinstance(text, str) or not text.strip():
+            continue
+        try:
+            bitmaps[i] = parse_schedule(text)
+        except ValueError as e:
+            errors[text] = str(e)
+    return bitmaps, errors
+
+
+def week_slot(when):
+    """
+    Slot index (0 .. SLOTS_PER_WEEK - 1) of a datetime, in LOCAL_TZ
+    """
+    if when.tzinfo is not None:
+        when = when.astimezone(LOCAL_TZ)
+    return when.weekday() * SLOTS_PER_DAY + (when.hour * 60 + when.minute) // SLOT_MINUTES
+
+
+def open_fraction(bitmaps):
+    """
+    Share of the week (0 .. 1) each of `bitmaps` is open
+    """
+    return np.unpackbits(bitmaps, axis=1).sum(axis=1) / SLOTS_PER_WEEK
+
+
+def is_open(bitmaps, slot):
+    """
+    Boolean mask: which of `bitmaps` (n × SCHEDULE_BYTES) are open at `slot`
+    """
+    return (bitmaps[:, slot >> 3] >> (7 - (slot & 7))) & 1 == 1
@@ -0,0 +1,9 @@
+# =========================
+# Benchmarks
+# =========================
+# Run from the repo root, e.g.:
+#   python -m benchmarks.bench_distance
+#
+# Whole-pipeline regression runs (JSON, comparable between commits):
+#   python -m benchmarks.suite --out before.json
+#   python -m benchmarks.suite --compare before.json after.json
@@ -0,0 +1,120 @@
+import json
+import time
+import asyncio
+import argparse
+import threading
+import numpy as np
+import httpx
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from fastapi import FastAPI
+from geopy.geocoders import Nominatim
+import api
+import geocode_utils
+from geocode_utils import GeocodeCache, geocode_location
+from recommend_doctors import recommend_doctors, doctor_data
+
+# =========================
+# Load test: blocking (old) vs async /recommend
+# =========================
+# python -m benchmarks.bench_async_load --latency-ms 300 --requests 400 --concurrency 100
+#
+# Geocoding goes to a local stub Nominatim with injected latency; the
+# gazetteer and geocode cache are disabled so every request pays it.
+
+
+def start_stub_geocoder(latency_ms):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # keep-alive, like the real service
+
+        def do_GET(self):
+            time.sleep(latency_ms / 1000)
+            body = json.dumps([{"lat": "28.5921", "lon": "77.0460", "display_name": "stub"}]).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address[1]
+
+
+def legacy_app():
+    """
+    The original blocking handler: plain `def`, sync geopy call
+    """
+    app = FastAPI()
+
+    @app.post("/recommend")
+    def recommend(data: api.FilterRequest):
+        lat, lng = geocode_location(data.location_text)
+        if lat is None:
+            return {"doctors": []}
+        results = recommend_doctors(
+            data.symptoms, lat, lng, data.location_text,
+            data.max_distance_km, data.max_fees, data.min_rating
+        )
+        if results.empty:
+            return {"doctors": []}
+        return {"doctors": results.to_dict(orient="records")}
+
+    return app
+
+
+async def run_load(app, n_requests, concurrency):
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, statuses = [], []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as client:
+        async def one(i):
+            payload = {
+                "symptoms": "knee pain",
+                "location_text": f"stub locality {i}",     # unique: no cache hits
+                "max_distance_km": 3,
+                "max_fees": 2000,
+                "min_rating": 4.0
+            }
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post("/recommend", json=payload)
+                latencies.append(time.perf_counter() - start)
+                statuses.append(response.status_code)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(n_requests)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "p50_ms": np.percentile(latencies, 50) * 1000,
+        "p99_ms": np.percentile(latencies, 99) * 1000,
+        "rps": n_requests / elapsed,
+        "errors": sum(s != 200 for s in statuses)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    port = start_stub_geocoder(args.latency_ms)
+    geocode_utils.USE_GAZETTEER = False
+    geocode_utils.NOMINATIM_URL = f"http://127.0.0.1:{port}/search"
+    geocode_utils.geolocator = Nominatim(user_agent="bench", domain=f"127.0.0.1:{port}", scheme="http")
+    doctor_data.get()
+
+    print(f"stub geocoder latency {args.latency_ms:.0f} ms, {args.requests} requests, concurrency {args.concurrency}")
+    print(f"{'path':>10} {'p50 ms':>8} {'p99 ms':>8} {'req/s':>8} {'errors':>7}")
+
+    for name, app in [("blocking", legacy_app()), ("async", api.app)]:
+        geocode_utils.geocode_cache = GeocodeCache(db_path=None)
+        r = asyncio.run(run_load(app, args.requests, args.concurrency))
+        print(f"{name:>10} {r['p50_ms']:>8.0f} {r['p99_ms']:>8.0f} {r['rps']:>8.1f} {r['errors']:>7}")
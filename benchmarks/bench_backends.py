@@ -0,0 +1,80 @@
+import sys
+import json
+import time
+import argparse
+import subprocess
+import numpy as np
+from inference_backends import BACKENDS
+from benchmarks.common import ensure_bench_model, validation_split, rss_mb
+
+# =========================
+# Inference backends: latency, RSS, top-1 agreement
+# =========================
+# python export_model.py            (once, writes the ONNX files)
+# python -m benchmarks.bench_backends --limit 300
+#
+# Each backend runs in its own process so RSS is not shared.
+
+
+def worker(backend, model_dir, limit):
+    import predict_specialist
+
+    predict_specialist.MODEL_DIR = model_dir
+    predict_specialist.INFERENCE_BACKEND = backend
+    predict_specialist.ML_MIN_CONFIDENCE = 0.0    # top-1 label, never the fallback
+    if predict_specialist.load_ml_model() is None:
+        return {"backend": backend, "error": "failed to load"}
+
+    texts, labels, label_map = validation_split()
+    texts, labels = texts[:limit], labels[:limit]
+
+    latencies, preds = [], []
+    for text in texts:
+        start = time.perf_counter()
+        preds.append(label_map[predict_specialist._ml_predict([text.lower()])[0].specialist])
+        latencies.append(time.perf_counter() - start)
+
+    return {
+        "backend": backend,
+        "p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "p99_ms": float(np.percentile(latencies, 99) * 1000),
+        "rss_mb": rss_mb(),
+        "accuracy": float(np.mean(np.array(preds) == np.array(labels))),
+        "preds": preds
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=300)
+    parser.add_argument("--backends", nargs="+", default=BACKENDS)
+    parser.add_argument("--worker")
+    parser.add_argument("--model-dir")
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(worker(args.worker, args.model_dir, args.limit)))
+        sys.exit()
+
+    model_dir = ensure_bench_model()
+    results = []
+    for backend in args.backends:
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_backends",
+             "--worker", backend, "--model-dir", model_dir, "--limit", str(args.limit)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        results.append(json.loads(out.strip().splitlines()[-1]))
+
+    reference = next((r["preds"] for r in results if r["backend"] == "torch" and "preds" in r), None)
+
+    print(f"{'backend':>11} {'p50 ms':>8} {'p99 ms':>8} {'RSS MB':>8} {'acc':>7} {'agree':>7}")
+    for r in results:
+        if "error" in r:
+            print(f"{r['backend']:>11}  {r['error']}")
+            continue
+        agree = np.mean(np.array(r["preds"]) == np.array(reference)) if reference else float("nan")
+        print(
+            f"{r['backend']:>11} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f} "
+            f"{r['rss_mb']:>8.0f} {r['accuracy']:>7.1%} {agree:>7.1%}"
+        )
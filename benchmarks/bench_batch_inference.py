@@ -0,0 +1,80 @@
+import argparse
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import predict_specialist
+from batch_inference import MicroBatcher
+from benchmarks.common import ensure_bench_model, SYMPTOM_CSV
+
+# =========================
+# DistilBERT fallback throughput: batch size and micro-batching
+# =========================
+# python -m benchmarks.bench_batch_inference --texts 256
+#
+# 3️⃣ drives predict_specialist_async the way /recommend does (rules
+# and the TF-IDF tier bypassed, so every text reaches the model).
+
+
+async def api_path(texts, clients):
+    semaphore = asyncio.Semaphore(clients)
+
+    async def one(text):
+        async with semaphore:
+            return await predict_specialist.predict_specialist_async(text)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(t) for t in texts))
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--texts", type=int, default=256)
+    parser.add_argument("--clients", type=int, default=32)
+    args = parser.parse_args()
+
+    predict_specialist.MODEL_DIR = ensure_bench_model()
+    predict_specialist.ml_model.set(predict_specialist.load_ml_model())
+
+    texts = pd.read_csv(SYMPTOM_CSV)["text"].str.lower().sample(args.texts, random_state=0).tolist()
+
+    # 1️⃣ raw batched forward passes
+    print(f"{'batch size':>10} {'texts/s':>10}")
+    for batch_size in [1, 8, 32]:
+        start = time.perf_counter()
+        for i in range(0, len(texts), batch_size):
+            predict_specialist._ml_predict(texts[i:i + batch_size])
+        elapsed = time.perf_counter() - start
+        print(f"{batch_size:>10} {len(texts) / elapsed:>10.1f}")
+
+    # 2️⃣ concurrent callers: one-at-a-time vs micro-batcher
+    batcher = MicroBatcher(predict_specialist._ml_predict, max_batch_size=32, max_wait_ms=5)
+    serial_lock = __import__("threading").Lock()
+
+    def one_at_a_time(text):
+        with serial_lock:
+            return predict_specialist._ml_predict([text])[0]
+
+    print(f"\n{args.clients} concurrent clients")
+    for name, fn in [("unbatched", one_at_a_time), ("micro-batched", batcher)]:
+        with ThreadPoolExecutor(args.clients) as pool:
+            start = time.perf_counter()
+            labels = list(pool.map(fn, texts))
+            elapsed = time.perf_counter() - start
+        print(f"{name:>14}: {len(texts) / elapsed:>8.1f} texts/s")
+
+    print(f"batcher: {batcher.stats()}")
+
+    # 3️⃣ the async API path, batching off vs on
+    predict_specialist.predict_by_rules = lambda text: None
+    predict_specialist.tfidf_model.set(None)
+
+    print(f"\npredict_specialist_async, {args.clients} concurrent requests")
+    for batching in [False, True]:
+        predict_specialist.ML_BATCHING = batching
+        predict_specialist.specialist_cache.clear()
+        elapsed = asyncio.run(api_path(texts, args.clients))
+        print(f"{'batching ' + ('on' if batching else 'off'):>14}: {len(texts) / elapsed:>8.1f} texts/s")
+
+    print(f"ml_batcher: {predict_specialist.ml_batcher.stats()}")
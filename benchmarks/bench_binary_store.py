@@ -0,0 +1,83 @@
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+from doctor_store import save_binary_store, store_path
+from benchmarks.common import load_doctors_scaled
+
+# =========================
+# Worker cold load: CSV parse vs memory-mapped binary store
+# =========================
+# python -m benchmarks.bench_binary_store --sizes 1521 100000 1000000 --workers 4
+#
+# Each worker is a fresh interpreter (like a uvicorn worker) that loads
+# the directory and answers one query. "private MB" is the memory only
+# that worker holds (Private_Clean + Private_Dirty from smaps_rollup);
+# mapped store pages are shared between workers and counted once by
+# the kernel.
+
+WORKER = """
+import sys, json, time
+import recommend_doctors as rd
+
+def mem():
+    out = {}
+    for line in open("/proc/self/smaps_rollup"):
+        key, _, value = line.partition(":")
+        if key in ("Rss", "Private_Clean", "Private_Dirty"):
+            out[key] = int(value.split()[0]) / 1024
+    return out["Rss"], out["Private_Clean"] + out["Private_Dirty"]
+
+rd.USE_BINARY_STORE = sys.argv[2] == "store"
+rss0, private0 = mem()
+start = time.perf_counter()
+store = rd.load_doctor_data(sys.argv[1])
+load_s = time.perf_counter() - start
+rd.doctor_data.set(store)
+rd.recommend_doctors("", 28.5921, 77.0460, "dwarka", 3, 2000, 0.0, specialist="cardiology", limit=10)
+rss1, private1 = mem()
+print(json.dumps({"load_s": load_s, "rss": rss1 - rss0, "private": private1 - private0}))
+"""
+
+
+def run_workers(csv_path, mode, n_workers):
+    env = dict(os.environ, HF_HUB_OFFLINE="1")
+    procs = [
+        subprocess.Popen([sys.executable, "-c", WORKER, csv_path, mode],
+                         stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env, text=True)
+        for _ in range(n_workers)
+    ]
+    results = [json.loads(p.communicate()[0].strip().splitlines()[-1]) for p in procs]
+    return {k: sum(r[k] for r in results) / len(results) for k in results[0]}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1521, 100_000, 1_000_000])
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'doctors':>10} {'source':>7} {'load ms':>9} {'RSS MB':>8} {'private MB':>11} {'disk MB':>8}")
+
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "doctors.csv")
+            load_doctors_scaled(n, jitter_deg=0.05).to_csv(csv_path, index=False)
+            save_binary_store(csv_path)
+
+            store_dir = store_path(csv_path)
+            sizes = {
+                "csv": os.path.getsize(csv_path),
+                "store": sum(os.path.getsize(os.path.join(store_dir, f)) for f in os.listdir(store_dir))
+            }
+
+            for mode in ("csv", "store"):
+                # warm the page cache so both rows measure parsing, not disk
+                run_workers(csv_path, mode, 1)
+                r = run_workers(csv_path, mode, args.workers)
+                print(
+                    f"{n:>10,} {mode:>7} {r['load_s'] * 1000:>9.1f} {r['rss']:>8.1f} "
+                    f"{r['private']:>11.1f} {sizes[mode] / 2**20:>8.1f}"
+                )
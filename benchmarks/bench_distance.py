@@ -0,0 +1,52 @@
+import argparse
+import numpy as np
+from distance_utils import get_distance_km, get_distances_km
+from benchmarks.common import load_doctors_scaled, best_of, PATIENT_LAT, PATIENT_LNG
+
+# =========================
+# Scalar (apply) vs vectorized Haversine
+# =========================
+# python -m benchmarks.bench_distance --rows 1000000
+
+
+def scalar_path(df):
+    return df.apply(
+        lambda row: get_distance_km(
+            PATIENT_LAT,
+            PATIENT_LNG,
+            row["latitude"],
+            row["longitude"]
+        ),
+        axis=1
+    ).to_numpy()
+
+
+def vector_path(df, use_float32=False):
+    return get_distances_km(
+        PATIENT_LAT,
+        PATIENT_LNG,
+        df["latitude"].to_numpy(),
+        df["longitude"].to_numpy(),
+        use_float32=use_float32
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--scalar-repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    df = load_doctors_scaled(args.rows)
+    print(f"📊 {len(df):,} doctors")
+
+    t_scalar, d_scalar = best_of(lambda: scalar_path(df), repeat=args.scalar_repeat)
+    t_vec64, d_vec64 = best_of(lambda: vector_path(df))
+    t_vec32, d_vec32 = best_of(lambda: vector_path(df, use_float32=True))
+
+    print(f"apply (scalar)      : {t_scalar * 1000:10.1f} ms")
+    print(f"vectorized float64  : {t_vec64 * 1000:10.1f} ms  ({t_scalar / t_vec64:,.0f}x)")
+    print(f"vectorized float32  : {t_vec32 * 1000:10.1f} ms  ({t_scalar / t_vec32:,.0f}x)")
+
+    print(f"max |float64 - scalar| : {np.abs(d_vec64 - d_scalar).max():.4f} km")
+    print(f"max |float32 - scalar| : {np.abs(d_vec32 - d_scalar).max():.4f} km")
@@ -0,0 +1,112 @@
+import gc
+import os
+import argparse
+import tempfile
+import tracemalloc
+import numpy as np
+import pandas as pd
+import recommend_doctors
+from recommend_doctors import load_doctor_data, smallest_radius, DISTANCE_LEVELS
+from benchmarks.common import (
+    load_doctors_scaled, best_of, build_speciality_index, query_specialities, PATIENT_LAT, PATIENT_LNG
+)
+
+# =========================
+# pandas DataFrame engine vs columnar DoctorStore
+# =========================
+# python -m benchmarks.bench_doctor_store --sizes 1521 100000 1000000
+#
+# The synthetic directory is written to CSV and read back, so every
+# string cell is its own object, as with a real feed.
+
+QUERIES = [
+    # (specialist, location_text)
+    ("cardiology", "dwarka"),          # locality match
+    ("cardiology", "somewhere else"),  # distance fallback
+]
+
+
+def load_frame(csv_path):
+    """
+    The DataFrame load recommend_doctors used before DoctorStore
+    """
+    doctor_df = pd.read_csv(csv_path)
+    doctor_df["area"] = doctor_df["area"].astype(str).str.lower().str.strip()
+    doctor_df["speciality"] = doctor_df["speciality"].astype(str).str.lower().str.strip()
+    return doctor_df, build_speciality_index(doctor_df)
+
+
+def pandas_engine(doctor_df, speciality_index, specialist, location_text):
+    """
+    The DataFrame engine recommend_doctors used before DoctorStore
+    """
+    specialist_pos = speciality_index[specialist][0]
+    user_area = location_text.lower().split(",")[0].strip()
+    locality_pos = specialist_pos[
+        doctor_df["area"].iloc[specialist_pos].str.startswith(user_area).to_numpy()
+    ]
+    locality_used = len(locality_pos) > 0
+
+    base_pos, distances = query_specialities(
+        speciality_index, [specialist], PATIENT_LAT, PATIENT_LNG, max(DISTANCE_LEVELS)
+    )
+    if locality_used:
+        keep = np.isin(base_pos, locality_pos)
+        base_pos, distances = base_pos[keep], distances[keep]
+
+    ok = (
+        (doctor_df["fees"].to_numpy()[base_pos] <= 2000) &
+        (doctor_df["rating"].to_numpy()[base_pos] >= 4.0)
+    )
+    radius = smallest_radius(distances[ok], 3)
+    keep = ok & (distances <= radius)
+    df = doctor_df.iloc[base_pos[keep]].copy()
+    df["distance_km"] = distances[keep]
+    df = df.sort_values(by=["rating", "distance_km"], ascending=[False, True])
+    return df.to_dict(orient="records")
+
+
+def store_engine(specialist, location_text):
+    results = recommend_doctors.recommend_doctors(
+        "", PATIENT_LAT, PATIENT_LNG, location_text, 3, 2000, 4.0, specialist=specialist
+    )
+    return results.to_dict(orient="records")
+
+
+def traced(fn):
+    gc.collect()
+    tracemalloc.start()
+    value = fn()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, current / 2**20
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1521, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'doctors':>10} {'df MB':>8} {'store MB':>9} {'query':>15} {'pandas ms':>10} {'store ms':>9} {'speedup':>8}")
+
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "doctors.csv")
+            load_doctors_scaled(n, jitter_deg=0.05).to_csv(csv_path, index=False)
+
+            # pandas: normalized frame + per-speciality index
+            (doctor_df, speciality_index), df_mb = traced(lambda: load_frame(csv_path))
+            store, store_mb = traced(lambda: load_doctor_data(csv_path))
+
+        recommend_doctors.doctor_data.set(store)
+
+        for specialist, location_text in QUERIES:
+            t_pandas, a = best_of(lambda: pandas_engine(doctor_df, speciality_index, specialist, location_text))
+            t_store, b = best_of(lambda: store_engine(specialist, location_text))
+            assert [r["doctor_name"] for r in a] == [r["doctor_name"] for r in b]
+
+            print(
+                f"{n:>10,} {df_mb:>8.1f} {store_mb:>9.1f} {location_text:>15} "
+                f"{t_pandas * 1000:>10.2f} {t_store * 1000:>9.2f} {t_pandas / t_store:>7.1f}x"
+            )
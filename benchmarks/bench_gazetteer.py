@@ -0,0 +1,64 @@
+import time
+import random
+import pandas as pd
+from gazetteer import Gazetteer, MIN_CONFIDENCE
+from benchmarks.common import DOCTOR_CSV
+
+# =========================
+# Offline gazetteer: build time, lookup latency, confident-hit rate
+# =========================
+# python -m benchmarks.bench_gazetteer
+
+# a known locality name plus words from somewhere else: must not be
+# confident, so geocode_utils asks Nominatim
+OUT_OF_AREA = [
+    "dwarka gujarat",
+    "dwarka expressway gurgaon",
+    "rohini sector 3 bangalore",
+    "shahdara lahore pakistan",
+]
+
+# too short to be a locality, or only the city
+TOO_VAGUE = ["d", "r", "s", "dw", "delhi", "new delhi, india"]
+
+
+if __name__ == "__main__":
+    df = pd.read_csv(DOCTOR_CSV)
+
+    start = time.perf_counter()
+    gazetteer = Gazetteer.from_dataframe(df)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    # user-style variants of the dataset localities
+    places = list(df["area"].unique()) + list(df["address"].unique())
+    variants = {
+        "as written": lambda p: p,
+        "shuffled words": lambda p: " ".join(reversed(p.replace(",", " ").split())),
+        "prefix": lambda p: p[: max(4, len(p) * 2 // 3)],
+        "typo": lambda p: p[:2] + p[3:] if len(p) > 5 else p,
+    }
+
+    rng = random.Random(0)
+    print(f"📍 {len(gazetteer)} localities, built in {build_ms:.1f} ms")
+    print(f"{'variant':>15} {'µs / query':>11} {'confident':>10}")
+
+    for name, variant in variants.items():
+        queries = [variant(p) for p in places]
+        rng.shuffle(queries)
+
+        start = time.perf_counter()
+        matches = [gazetteer.lookup(q) for q in queries]
+        per_query = (time.perf_counter() - start) / len(queries) * 1e6
+
+        confident = sum(1 for m in matches if m and m.confidence >= MIN_CONFIDENCE)
+        print(f"{name:>15} {per_query:>11.1f} {confident / len(queries):>9.0%}")
+
+    for query in OUT_OF_AREA:
+        match = gazetteer.lookup(query)
+        assert match is None or match.confidence < MIN_CONFIDENCE, (query, match)
+    print(f"✅ {len(OUT_OF_AREA)} out-of-area queries below MIN_CONFIDENCE")
+
+    for query in TOO_VAGUE:
+        match = gazetteer.lookup(query)
+        assert match is None or match.confidence < MIN_CONFIDENCE, (query, match)
+    print(f"✅ {len(TOO_VAGUE)} vague queries below MIN_CONFIDENCE")
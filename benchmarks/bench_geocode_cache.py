@@ -0,0 +1,130 @@
+import os
+import argparse
+import time
+import random
+import tempfile
+from types import SimpleNamespace
+import pandas as pd
+import geocode_utils
+from geocode_utils import GeocodeCache, geocode_location, normalize_location
+from benchmarks.common import DOCTOR_CSV
+
+# =========================
+# Geocode cache with a stub geocoder (no network)
+# =========================
+# python -m benchmarks.bench_geocode_cache --latency-ms 200 --queries 2000
+#
+# Checks the cache semantics first (TTLs, LRU, disk tier, keys), then
+# times a dataset-shaped query mix against the stub.
+
+
+class StubGeocoder:
+    """
+    Stands in for Nominatim: fixed latency, Delhi-ish point,
+    "not found" for anything containing "nowhere".
+    """
+
+    def __init__(self, latency_ms):
+        self.latency = latency_ms / 1000
+        self.calls = 0
+
+    def geocode(self, text, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        if "nowhere" in text.lower():
+            return None
+        return SimpleNamespace(latitude=28.6, longitude=77.1)
+
+
+def check_cache():
+    point = (28.6, 77.1)
+
+    # keys: case, spacing and a comma-separated city collapse...
+    for variant in ["Dwarka", "  dwarka ,  delhi", "DWARKA, New Delhi", "dwarka, delhi, india"]:
+        assert normalize_location(variant) == "dwarka", variant
+    # ...a city word that is part of the place name does not
+    for place in ["old delhi", "east delhi", "karol bagh new delhi"]:
+        assert normalize_location(place) == place, place
+
+    # TTL expiry, negative results expire sooner
+    cache = GeocodeCache(db_path=None, ttl=0.2, negative_ttl=0.05)
+    cache.set("found", point)
+    cache.set("missing", (None, None))
+    assert cache.get("found") == (True, point)
+    assert cache.get("missing") == (True, (None, None))
+    time.sleep(0.1)
+    assert cache.get("found") == (True, point)
+    assert cache.get("missing")[0] is False
+    time.sleep(0.15)
+    assert cache.get("found")[0] is False
+
+    # LRU: a read refreshes, the least recently used goes
+    cache = GeocodeCache(db_path=None, max_memory=2)
+    cache.set("a", point)
+    cache.set("b", point)
+    cache.get("a")
+    cache.set("c", point)
+    assert "a" in cache and "c" in cache and "b" not in cache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "geocode.sqlite")
+
+        # disk tier: a new instance (a restarted worker) reuses entries
+        GeocodeCache(db_path=db_path).set("dwarka", point)
+        cache = GeocodeCache(db_path=db_path)
+        assert cache.get("dwarka") == (True, point)
+        assert cache.stats()["hits_disk"] == 1
+        assert cache.get("dwarka") == (True, point)
+        assert cache.stats()["hits_memory"] == 1
+
+        # expired rows are purged from disk every `purge_every` writes
+        cache = GeocodeCache(db_path=db_path, negative_ttl=0.01, purge_every=10)
+        for i in range(9):
+            cache.set(f"nowhere {i}", (None, None))
+        time.sleep(0.02)
+        cache.set("rohini", point)
+        rows = cache._db.execute("SELECT key FROM geocode").fetchall()
+        assert sorted(k for k, in rows) == ["dwarka", "rohini"], rows
+
+    print("✅ cache checks passed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    check_cache()
+
+    stub = StubGeocoder(args.latency_ms)
+    geocode_utils.geolocator = stub
+    geocode_utils.USE_GAZETTEER = False
+    geocode_utils.geocode_cache = GeocodeCache(db_path=None)
+
+    # user-style variants of the dataset localities
+    df = pd.read_csv(DOCTOR_CSV, usecols=["area", "address"])
+    places = list(df["area"].unique()) + list(df["address"].unique()) + ["nowhere land"]
+    variants = [
+        lambda p: p,
+        lambda p: p.upper(),
+        lambda p: f"  {p} ,  delhi",
+        lambda p: f"{p}, New Delhi",
+    ]
+
+    rng = random.Random(0)
+    queries = [rng.choice(variants)(rng.choice(places)) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    for q in queries:
+        geocode_location(q)
+    elapsed = time.perf_counter() - start
+
+    stats = geocode_utils.geocode_cache.stats()
+    uncached = args.queries * stub.latency
+
+    print(f"queries          : {args.queries}")
+    print(f"geocoder calls   : {stub.calls}")
+    print(f"hit rate         : {stats['hit_rate']:.1%}")
+    print(f"cached total     : {elapsed:.2f} s")
+    print(f"uncached (est.)  : {uncached:.2f} s")
@@ -0,0 +1,45 @@
+import argparse
+import numpy as np
+from doctor_store import DoctorStore
+from benchmarks.common import load_doctors_scaled, best_of
+
+# =========================
+# Strict locality filter: str.startswith scan vs sorted-area runs
+# =========================
+# python -m benchmarks.bench_locality --rows 1000000 --areas 50000
+
+SPECIALITY = "cardiology"
+
+
+def scan(speciality_df, prefix):
+    """
+    The original step 2: startswith over every doctor of the speciality
+    """
+    return np.flatnonzero(speciality_df["area"].str.startswith(prefix).to_numpy())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--areas", type=int, default=50_000)
+    args = parser.parse_args()
+
+    df = load_doctors_scaled(args.rows)
+    rng = np.random.default_rng(0)
+    suffix = rng.integers(0, args.areas // df["area"].nunique(), len(df))
+    df["area"] = df["area"] + " block " + suffix.astype(str)
+
+    store = DoctorStore(df)
+    speciality_df = df[df["speciality"] == SPECIALITY]
+    print(f"📊 {len(df):,} doctors, {df['area'].nunique():,} distinct areas, "
+          f"{len(speciality_df):,} {SPECIALITY}")
+
+    prefixes = ["dwarka block 17", "dwarka block 1", "rohini", "zzz", ""]
+    print(f"{'prefix':>17} {'matches':>9} {'scan ms':>9} {'index µs':>9}")
+
+    for prefix in prefixes:
+        t_scan, hits = best_of(lambda: scan(speciality_df, prefix))
+        t_index, (lo, hi) = best_of(lambda: store.locality_range(SPECIALITY, prefix))
+        assert hi - lo == len(hits)
+        assert sorted(store.row_ids[lo:hi]) == sorted(speciality_df.index[hits])
+        print(f"{prefix!r:>17} {hi - lo:>9,} {t_scan * 1000:>9.2f} {t_index * 1e6:>9.1f}")
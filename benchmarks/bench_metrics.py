@@ -0,0 +1,56 @@
+import argparse
+from contextlib import nullcontext
+import metrics
+import recommend_doctors
+from benchmarks.common import best_of, PATIENT_LAT, PATIENT_LNG
+
+# =========================
+# Instrumentation overhead on the engine call
+# =========================
+# python -m benchmarks.bench_metrics --calls 2000
+#
+# Same recommend_doctors() calls with the stage histograms / counters on,
+# then with them swapped for no-ops.
+
+
+def engine(calls):
+    for _ in range(calls):
+        recommend_doctors.recommend_doctors(
+            "", PATIENT_LAT, PATIENT_LNG, "dwarka", 3, 2000, 0.0,
+            specialist="cardiology", limit=10
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    recommend_doctors.doctor_data.get()
+    engine(100)
+
+    instrumented = (metrics.stage_seconds.time, metrics.radius_used.inc, metrics.empty_results.inc)
+
+    def set_metrics(on):
+        if on:
+            metrics.stage_seconds.time, metrics.radius_used.inc, metrics.empty_results.inc = instrumented
+        else:
+            metrics.stage_seconds.time = lambda *labels: nullcontext()
+            metrics.radius_used.inc = metrics.empty_results.inc = lambda *labels, amount=1: None
+
+    # alternate on / off so drift (GC, CPU frequency) hits both equally
+    t_on = t_off = float("inf")
+    for _ in range(5):
+        for on in (True, False):
+            set_metrics(on)
+            t, _ = best_of(lambda: engine(args.calls), repeat=1)
+            if on:
+                t_on = min(t_on, t)
+            else:
+                t_off = min(t_off, t)
+
+    per_call_on = t_on / args.calls * 1e6
+    per_call_off = t_off / args.calls * 1e6
+    print(f"metrics on  {per_call_on:8.1f} µs / call")
+    print(f"metrics off {per_call_off:8.1f} µs / call")
+    print(f"overhead    {per_call_on - per_call_off:8.1f} µs / call ({(t_on / t_off - 1) * 100:.1f}%)")
@@ -0,0 +1,106 @@
+import os
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+import preprocess_doctors as pp
+from benchmarks.common import load_doctors_scaled, best_of
+
+# =========================
+# preprocess_doctors.py: old script vs chunked pipeline
+# =========================
+# python -m benchmarks.bench_preprocess --rows 1000000
+#
+# Synthetic raw feed in the Excel column layout (as CSV), with 1% bad
+# rows and 1% repeated doctors. "incremental" merges a 1% delta feed
+# (half updates, half new doctors) into the full output.
+
+RAW_COLUMNS = {v: k for k, v in pp.COLUMN_MAP.items() if k != "availability_text"}
+
+
+def make_feed(n_rows, path, seed=0):
+    df = load_doctors_scaled(n_rows, seed=seed, jitter_deg=0.05)
+    # unique doctors, so de-duplication has real work to do
+    df["doctor_name"] = df["doctor_name"] + " #" + np.arange(n_rows).astype(str)
+    df = df.rename(columns={"availability_text": "availability"}).drop(columns="availability_flag")
+
+    rng = np.random.default_rng(seed)
+    bad = rng.choice(n_rows, n_rows // 100, replace=False)
+    df["latitude"] = df["latitude"].astype(object)
+    df.loc[bad[0::3], "latitude"] = "n/a"
+    df.loc[bad[1::3], "rating"] = 9.9
+    df.loc[bad[2::3], "fees"] = -100
+
+    dups = df.iloc[rng.choice(n_rows, n_rows // 100, replace=False)]
+    df = pd.concat([df, dups], ignore_index=True)
+    df.rename(columns=RAW_COLUMNS).to_csv(path, index=False)
+    return df
+
+
+def make_delta(feed, path, fraction=0.01, seed=1):
+    rng = np.random.default_rng(seed)
+    k = int(len(feed) * fraction)
+    updates = feed.iloc[rng.choice(len(feed), k // 2, replace=False)].copy()
+    updates["fees"] = 1234.0
+    added = feed.iloc[rng.choice(len(feed), k - k // 2, replace=False)].copy()
+    added["doctor_name"] = added["doctor_name"] + " (new)"
+    pd.concat([updates, added]).rename(columns=RAW_COLUMNS).to_csv(path, index=False)
+
+
+def legacy(path, output_csv):
+    """
+    The original preprocess_doctors.py (read_csv instead of read_excel)
+    """
+    df = pd.read_csv(path)
+    df.rename(columns=pp.COLUMN_MAP, inplace=True)
+    df = df.loc[:, ~df.columns.str.contains('unnamed', case=False)]
+    df['speciality'] = df['speciality'].str.lower().str.strip()
+    df['area'] = df['area'].str.lower().str.strip()
+    df['fees'] = df['fees'].fillna(df['fees'].median())
+    df['rating'] = df['rating'].fillna(df['rating'].median())
+    df['availability_text'] = df['availability']
+    df['availability_flag'] = df['availability'].apply(
+        lambda x: 0 if pd.isna(x) or str(x).strip() == "" else 1
+    )
+    df.drop(columns=['availability'], inplace=True)
+    df = df.dropna(subset=['latitude', 'longitude'])
+    df['fees'] = df['fees'].astype(float)
+    df['rating'] = df['rating'].astype(float)
+    df['availability_flag'] = df['availability_flag'].astype(int)
+    df.to_csv(output_csv, index=False)
+    return len(df)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=pp.CHUNK_SIZE)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        feed_path = os.path.join(tmp, "feed.csv")
+        delta_path = os.path.join(tmp, "delta.csv")
+        out = os.path.join(tmp, "clean.csv")
+        rejects = os.path.join(tmp, "rejected.csv")
+
+        feed = make_feed(args.rows, feed_path)
+        make_delta(feed, delta_path)
+        print(f"📊 feed: {len(feed):,} rows ({os.path.getsize(feed_path) / 2**20:.0f} MB)")
+
+        # the legacy script does not validate: "n/a" coordinates leave the
+        # latitude column as text, so it is only timed, not compared
+        t_legacy, n_legacy = best_of(lambda: legacy(feed_path, os.path.join(tmp, "legacy.csv")), repeat=1)
+        print(f"legacy script      {t_legacy:7.2f} s  {n_legacy:,} rows written (no validation / dedup)")
+
+        t_full, summary = best_of(lambda: pp.run_pipeline(feed_path, out, rejects, chunk_size=args.chunk_size), repeat=1)
+        print(f"pipeline (full)    {t_full:7.2f} s  {summary}")
+
+        t_incr, summary = best_of(
+            lambda: pp.run_pipeline(delta_path, out, rejects, incremental=True, chunk_size=args.chunk_size),
+            repeat=1
+        )
+        print(f"pipeline (delta)   {t_incr:7.2f} s  {summary}")
+
+        result = pd.read_csv(out)
+        assert len(result) == summary["rows"]
+        assert (result["fees"] == 1234.0).sum() >= summary["updated"]
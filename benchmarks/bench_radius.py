@@ -0,0 +1,90 @@
+import argparse
+import numpy as np
+from recommend_doctors import DISTANCE_LEVELS, smallest_radius
+from benchmarks.common import (
+    load_doctors_scaled, best_of, build_speciality_index, query_specialities, PATIENT_LAT, PATIENT_LNG
+)
+
+# =========================
+# Auto-expand radius: per-level loop vs single pass
+# =========================
+# python -m benchmarks.bench_radius --rows 500000
+#
+# "miss" queries only qualify at 10 km or not at all, which is where
+# the old loop paid for three filter-and-copy passes.
+
+SPECIALITY = "cardiology"
+
+
+def loop_path(df_base, max_distance_km, max_fees, min_rating):
+    for radius in DISTANCE_LEVELS:
+        if radius < max_distance_km:
+            continue
+
+        df = df_base[
+            (df_base["distance_km"] <= radius) &
+            (df_base["fees"] <= max_fees) &
+            (df_base["rating"] >= min_rating)
+        ].copy()
+
+        if not df.empty:
+            df["used_radius_km"] = radius
+            return df.sort_values(by=["rating", "distance_km"], ascending=[False, True])
+
+    return None
+
+
+def single_pass(df, base_pos, distances, max_distance_km, max_fees, min_rating):
+    ok = (
+        (df["fees"].to_numpy()[base_pos] <= max_fees) &
+        (df["rating"].to_numpy()[base_pos] >= min_rating)
+    )
+    radius = smallest_radius(distances[ok], max_distance_km)
+    if radius is None:
+        return None
+
+    keep = ok & (distances <= radius)
+    out = df.iloc[base_pos[keep]].copy()
+    out["distance_km"] = distances[keep]
+    out["used_radius_km"] = radius
+    return out.sort_values(by=["rating", "distance_km"], ascending=[False, True])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500_000)
+    args = parser.parse_args()
+
+    df = load_doctors_scaled(args.rows, jitter_deg=0.05)
+    index = build_speciality_index(df)
+    base_pos, distances = query_specialities(
+        index, [SPECIALITY], PATIENT_LAT, PATIENT_LNG, max(DISTANCE_LEVELS)
+    )
+
+    # cap ratings within 5 km so "min_rating 4.5" only qualifies at 10 km
+    near = base_pos[distances <= 5]
+    df.loc[df.index[near], "rating"] = df["rating"].to_numpy()[near].clip(max=4.0)
+
+    df_base = df.iloc[base_pos].copy()
+    df_base["distance_km"] = distances
+
+    cases = {
+        "hit @ 3 km": (3, 5000, 0.0),
+        "hit @ 10 km": (3, 5000, 4.5),
+        "no match": (3, 5000, 6.0),
+    }
+
+    print(f"📊 {len(df_base):,} {SPECIALITY} doctors within {max(DISTANCE_LEVELS)} km")
+    print(f"{'query':>12} {'loop ms':>10} {'single ms':>10} {'speedup':>8}")
+
+    for name, q in cases.items():
+        t_loop, r_loop = best_of(lambda: loop_path(df_base, *q))
+        t_single, r_single = best_of(lambda: single_pass(df, base_pos, distances, *q))
+
+        if r_loop is None:
+            assert r_single is None
+        else:
+            assert r_loop.index.equals(r_single.index)
+            assert np.array_equal(r_loop["used_radius_km"], r_single["used_radius_km"])
+
+        print(f"{name:>12} {t_loop * 1000:>10.2f} {t_single * 1000:>10.2f} {t_loop / t_single:>7.1f}x")
@@ -0,0 +1,67 @@
+import argparse
+import numpy as np
+from doctor_store import DoctorStore, normalize_doctor_df
+from ranking import Candidates, CRITERIA, RANKING_PROFILES, rank
+from benchmarks.common import generate_doctors, best_of
+
+# =========================
+# Ranking stage: profiles vs candidate count
+# =========================
+# python -m benchmarks.bench_ranking --sizes 1000 10000 100000 1000000
+#
+# Every doctor of a synthetic directory is a candidate (distances drawn
+# within a 10 km radius); times rank() for the first page (--limit)
+# per profile, and the full lexicographic sort for reference.
+#
+# Some "dwarka" doctors are moved to "dwarka sector 6" / "dwarka sector 61"
+# and the patient types "dwarka sector 6", so the locality criterion has
+# every grade of match to score.
+
+LOCALITY = "dwarka sector 6"
+
+
+def candidates(n, seed=0):
+    df = generate_doctors(n, seed=seed)
+    rng = np.random.default_rng(seed)
+    dwarka = np.flatnonzero(df["area"].str.lower().str.strip() == "dwarka")
+    df.loc[dwarka[0::3], "area"] = "dwarka sector 6"
+    df.loc[dwarka[1::3], "area"] = "dwarka sector 61"
+
+    store = DoctorStore(normalize_doctor_df(df))
+    positions = np.arange(store.n_rows)
+    distance = rng.uniform(0, 10, store.n_rows)
+    return Candidates(store, positions, distance, 10, 2000, LOCALITY, list(store.slices))
+
+
+def check_locality(c):
+    expected = {"dwarka sector 6": 1.0, "dwarka": 0.5, "dwarka sector 61": 0.0}
+    areas = c.store.values["area"][c.store.area_code[c.positions]]
+    scores = CRITERIA["locality"](c)
+    for area, value in zip(areas, scores):
+        assert value == expected.get(area, 0.0), (area, value)
+    print("✅ locality scores: " + ", ".join(f"{a} {v}" for a, v in expected.items()) + ", elsewhere 0.0")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    check_locality(candidates(args.sizes[0]))
+
+    profiles = list(RANKING_PROFILES)
+    print(f"{'candidates':>10} {'full sort':>10} " + " ".join(f"{p:>15}" for p in profiles) + "   (ms, page of top-K)")
+
+    for n in args.sizes:
+        c = candidates(n)
+        t_full, _ = best_of(lambda: rank(c, "rating"), repeat=max(1, args.repeat // 4))
+        times = [best_of(lambda: rank(c, p, args.limit), repeat=args.repeat)[0] for p in profiles]
+        print(f"{n:>10,} {t_full * 1000:>10.3f} " + " ".join(f"{t * 1000:>15.3f}" for t in times))
+
+        # weighted pages agree with a full sort of the same scores
+        for p in profiles[1:]:
+            order, scores = rank(c, p, args.limit)
+            full, _ = rank(c, p)
+            assert np.array_equal(order, full[:args.limit]), p
@@ -0,0 +1,119 @@
+import os
+import argparse
+import tempfile
+import threading
+import numpy as np
+import recommend_doctors
+from gazetteer import Gazetteer
+from recommend_doctors import load_doctor_data, reload_doctor_data
+from benchmarks.common import load_doctors_scaled, best_of, PATIENT_LAT, PATIENT_LNG
+
+# =========================
+# Hot reload: what it costs, and reloads under query load
+# =========================
+# python -m benchmarks.bench_reload --rows 100000 --reloads 20 --threads 4
+#
+# Version B of the directory moves some dermatologists and raises
+# cardiology fees; every other row is unchanged. Version C only changes
+# fees of A, so reloading A -> C keeps the gazetteer. While the main thread
+# swaps A <-> B, query threads check that each answer is exactly the A
+# answer or the B answer (never a mix of the two).
+
+QUERIES = [
+    # (specialist, location_text, max_fees)
+    ("dermatology", "somewhere else", 2000),
+    ("cardiology", "dwarka", 1000),
+    ("orthopedics", "somewhere else", 2000),   # same in A and B
+]
+
+
+def make_versions(n_rows, tmp):
+    a = load_doctors_scaled(n_rows, jitter_deg=0.05)
+    b = a.copy()
+
+    rng = np.random.default_rng(1)
+    derm = np.flatnonzero((b["speciality"].str.lower().str.strip() == "dermatology").to_numpy())
+    moved = rng.choice(derm, len(derm) // 2, replace=False)
+    b.loc[b.index[moved], "latitude"] += 0.01
+
+    cardio = (b["speciality"].str.lower().str.strip() == "cardiology").to_numpy()
+    b.loc[cardio, "fees"] += 300
+
+    c = a.copy()
+    c["fees"] += 100
+
+    paths = os.path.join(tmp, "a.csv"), os.path.join(tmp, "b.csv"), os.path.join(tmp, "c.csv")
+    for df, path in zip([a, b, c], paths):
+        df.to_csv(path, index=False)
+    return paths
+
+
+def answer(specialist, location_text, max_fees):
+    results = recommend_doctors.recommend_doctors(
+        "", PATIENT_LAT, PATIENT_LNG, location_text, 3, max_fees, 0.0,
+        specialist=specialist, limit=20
+    )
+    return results.attrs.get("total_matches", 0), list(zip(results.index, results.get("fees", [])))
+
+
+def expected(path):
+    recommend_doctors.doctor_data.set(load_doctor_data(path))
+    return [answer(*q) for q in QUERIES]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--reloads", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path_a, path_b, path_c = make_versions(args.rows, tmp)
+
+        # 1️⃣ reload cost: doctor store, gazetteer; a fees-only change keeps the gazetteer
+        t_store, _ = best_of(lambda: load_doctor_data(path_b), repeat=3)
+        t_gazetteer, _ = best_of(lambda: Gazetteer.from_csv(path_b), repeat=3)
+        reload_doctor_data(path_b)
+        moved = reload_doctor_data(path_a)
+        fees_only = reload_doctor_data(path_c)
+        assert moved["gazetteer_rebuilt"] and not fees_only["gazetteer_rebuilt"]
+        print(f"📊 {args.rows:,} doctors: store {t_store * 1000:.0f} ms, gazetteer {t_gazetteer * 1000:.0f} ms; "
+              f"reload B -> A {moved['reload_ms']:.0f} ms, fees only {fees_only['reload_ms']:.0f} ms")
+
+        # 2️⃣ reloads concurrent with queries
+        answers = {"a": expected(path_a), "b": expected(path_b)}
+        for i in range(2):
+            assert answers["a"][i] != answers["b"][i], QUERIES[i]
+
+        stop = threading.Event()
+        counts = {"a": 0, "b": 0, "mixed": 0}
+        lock = threading.Lock()
+
+        def query_loop():
+            i = 0
+            while not stop.is_set():
+                q = i % len(QUERIES)
+                got = answer(*QUERIES[q])
+                kind = next((k for k, v in answers.items() if v[q] == got), "mixed")
+                with lock:
+                    counts[kind] += 1
+                i += 1
+
+        threads = [threading.Thread(target=query_loop) for _ in range(args.threads)]
+        for t in threads:
+            t.start()
+
+        reload_ms = []
+        for r in range(args.reloads):
+            summary = reload_doctor_data(path_a if r % 2 else path_b)
+            reload_ms.append(summary["reload_ms"])
+
+        stop.set()
+        for t in threads:
+            t.join()
+
+    print(f"🔁 {args.reloads} reloads (median {np.median(reload_ms):.0f} ms) under "
+          f"{args.threads} query threads: {counts['a']:,} A answers, "
+          f"{counts['b']:,} B answers, {counts['mixed']} inconsistent")
+    assert counts["mixed"] == 0
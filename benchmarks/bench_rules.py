@@ -0,0 +1,69 @@
+import time
+from collections import Counter
+import pandas as pd
+from specialist_rules import rule_table
+from predict_specialist import normalize_symptoms, predict_by_rules
+from benchmarks.common import SYMPTOM_CSV
+
+# =========================
+# Keyword rules: any()-chain vs word-form rule table
+# =========================
+# python -m benchmarks.bench_rules
+
+
+def legacy_rules(text):
+    """
+    The original predict_specialist rule chain (substring matching)
+    """
+    if any(w in text for w in ["joint", "knee", "bone", "arthritis"]):
+        return "Orthopedics"
+    if any(w in text for w in ["skin", "rash", "itch", "acne"]):
+        return "Dermatology"
+    if any(w in text for w in ["chest", "heart", "palpitation"]):
+        return "Cardiology"
+    if any(w in text for w in ["headache", "migraine", "seizure"]):
+        return "Neurology"
+    if any(w in text for w in ["fever", "vomiting", "cold", "weakness", "fatigue"]):
+        return "General Medicine"
+    return None
+
+
+def table_rules(text):
+    match = rule_table.match(text)
+    return match.specialist if match else None
+
+
+def timed(fn, texts, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        labels = [fn(t) for t in texts]
+        best = min(best, time.perf_counter() - start)
+    return best, labels
+
+
+if __name__ == "__main__":
+    df = pd.read_csv(SYMPTOM_CSV)
+    texts = df["text"].str.lower().str.strip().tolist()
+
+    # predict_specialist matches normalize_symptoms() output
+    normalized = [normalize_symptoms(t) for t in texts]
+
+    t_legacy, legacy = timed(legacy_rules, texts)
+    t_table, table = timed(table_rules, texts)
+    t_legacy_norm, _ = timed(legacy_rules, normalized)
+    t_table_norm, table_norm = timed(predict_by_rules, normalized)
+    assert table_norm == table
+
+    agree = sum(a == b for a, b in zip(legacy, table))
+    print(f"📊 {len(texts):,} texts          raw   normalized (µs / text)")
+    print(f"any() chain : {t_legacy * 1e6 / len(texts):12.2f} {t_legacy_norm * 1e6 / len(texts):12.2f}")
+    print(f"rule table  : {t_table * 1e6 / len(texts):12.2f} {t_table_norm * 1e6 / len(texts):12.2f}")
+    print(f"agreement   : {agree / len(texts):.2%} ({len(texts) - agree} differ)")
+
+    # where they differ, how often is each side right?
+    truth = df["Speciality"].replace({"Orthopaedics": "Orthopedics"}).tolist()
+    diffs = [(l, t, y) for l, t, y in zip(legacy, table, truth) if l != t]
+    print(f"on differing texts: legacy correct {sum(l == y for l, _, y in diffs)}, "
+          f"table correct {sum(t == y for _, t, y in diffs)}")
+    print("most common changes:", Counter((l, t) for l, t, _ in diffs).most_common(5))
@@ -0,0 +1,54 @@
+import argparse
+import numpy as np
+from distance_utils import get_distances_km
+from benchmarks.common import (
+    load_doctors_scaled, best_of, build_speciality_index, query_specialities, PATIENT_LAT, PATIENT_LNG
+)
+
+# =========================
+# Full scan vs grid index radius query
+# =========================
+# python -m benchmarks.bench_spatial_index --sizes 1521 100000 500000
+#
+# Coordinates are spread ±`--spread` degrees around the Delhi points so
+# the directory grows in area as well as density, like a national feed.
+
+RADIUS_KM = 10
+SPECIALITY = "cardiology"
+
+
+def full_scan(df):
+    sub = df[df["speciality"] == SPECIALITY]
+    dist = get_distances_km(
+        PATIENT_LAT,
+        PATIENT_LNG,
+        sub["latitude"].to_numpy(),
+        sub["longitude"].to_numpy()
+    )
+    keep = dist <= RADIUS_KM
+    return np.flatnonzero((df["speciality"] == SPECIALITY).to_numpy())[keep], dist[keep]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1521, 100_000, 500_000])
+    parser.add_argument("--spread", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"{'doctors':>10} {'build ms':>10} {'scan ms':>10} {'index ms':>10} {'speedup':>8} {'hits':>6}")
+
+    for n in args.sizes:
+        df = load_doctors_scaled(n, jitter_deg=args.spread)
+
+        t_build, index = best_of(lambda: build_speciality_index(df), repeat=1)
+        t_scan, (scan_pos, scan_dist) = best_of(lambda: full_scan(df))
+        t_index, (idx_pos, idx_dist) = best_of(
+            lambda: query_specialities(index, [SPECIALITY], PATIENT_LAT, PATIENT_LNG, RADIUS_KM)
+        )
+
+        assert np.array_equal(scan_pos, idx_pos) and np.array_equal(scan_dist, idx_dist)
+
+        print(
+            f"{n:>10,} {t_build * 1000:>10.1f} {t_scan * 1000:>10.2f} "
+            f"{t_index * 1000:>10.2f} {t_scan / t_index:>7.1f}x {len(idx_pos):>6}"
+        )
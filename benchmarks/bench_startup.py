@@ -0,0 +1,48 @@
+import sys
+import time
+import argparse
+import subprocess
+from benchmarks.common import ensure_bench_model
+
+# =========================
+# Cold start: lazy import of `api` vs loading everything up front
+# =========================
+# python -m benchmarks.bench_startup --repeat 3
+#
+# "eager" imports api and then runs api.warm_up() synchronously, which
+# is what every worker paid before components were loaded lazily.
+
+SNIPPETS = {
+    "lazy import": "import api",
+    "lazy + /greet": (
+        "import api\n"
+        "from fastapi.testclient import TestClient\n"
+        "TestClient(api.app).get('/greet')"
+    ),
+    "eager (old)": (
+        "import predict_specialist\n"
+        "predict_specialist.MODEL_DIR = {model_dir!r}\n"
+        "import api\n"
+        "api.warm_up()"
+    ),
+}
+
+
+def cold_run(code):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    model_dir = ensure_bench_model()
+
+    print(f"{'startup':>15} {'best s':>8}")
+    for name, code in SNIPPETS.items():
+        code = code.format(model_dir=model_dir)
+        best = min(cold_run(code) for _ in range(args.repeat))
+        print(f"{name:>15} {best:>8.2f}")
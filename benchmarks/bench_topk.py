@@ -0,0 +1,55 @@
+import os
+import json
+import argparse
+import tempfile
+import recommend_doctors
+from recommend_doctors import load_doctor_data
+from benchmarks.common import load_doctors_scaled, best_of, PATIENT_LAT, PATIENT_LNG
+
+# =========================
+# Full sort + serialize vs top-K page
+# =========================
+# python -m benchmarks.bench_topk --sizes 1521 100000 1000000 --limit 10
+#
+# "doctors" is the matching set after the filters (locality fallback,
+# 10 km radius); "full" sorts and serializes all of it like /recommend
+# did before paging, "page" returns only the first `limit` rows.
+
+COLUMNS = ["doctor_name", "area", "distance_km", "rating", "fees", "contact", "address", "availability_text"]
+
+
+def serve(limit, offset=0):
+    results = recommend_doctors.recommend_doctors(
+        "", PATIENT_LAT, PATIENT_LNG, "somewhere else", 10, 2000, 0.0,
+        specialist="cardiology", limit=limit, offset=offset
+    )
+    doctors = results[COLUMNS].to_dict(orient="records")
+    return results.attrs["total_matches"], doctors, json.dumps(doctors, default=str)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1521, 100_000, 1_000_000])
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'doctors':>10} {'matches':>9} {'full ms':>9} {'page ms':>9} {'speedup':>8} {'full KB':>9} {'page KB':>8}")
+
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "doctors.csv")
+            load_doctors_scaled(n, jitter_deg=0.05).to_csv(csv_path, index=False)
+            recommend_doctors.doctor_data.set(load_doctor_data(csv_path))
+
+        t_full, (total, full, full_json) = best_of(lambda: serve(None))
+        t_page, (page_total, page, page_json) = best_of(lambda: serve(args.limit))
+        _, (_, page2, _) = best_of(lambda: serve(args.limit, offset=args.limit), repeat=1)
+
+        assert total == page_total == len(full)
+        assert page == full[:args.limit]
+        assert page2 == full[args.limit:2 * args.limit]
+
+        print(
+            f"{n:>10,} {total:>9,} {t_full * 1000:>9.2f} {t_page * 1000:>9.2f} "
+            f"{t_full / t_page:>7.1f}x {len(full_json) / 1024:>9.1f} {len(page_json) / 1024:>8.1f}"
+        )
@@ -0,0 +1,114 @@
+import json
+import argparse
+import tempfile
+import torch
+from transformers import DistilBertConfig, DistilBertTokenizerFast, DistilBertForSequenceClassification
+import train
+from benchmarks.common import ensure_bench_model
+
+# =========================
+# train.py: seconds per epoch and per-class F1
+# =========================
+# python -m benchmarks.bench_train --epochs 2 --threads 4
+#
+# Same split, tokenizer, seed and a small random-init DistilBERT
+# (--layers / --dim; the real base model needs the Hub) under:
+#   legacy        whole corpus padded to its longest text (<= 512 tokens),
+#                 tensors rebuilt per item, random batches, plain loss
+#   dynamic_512   tokenized once, padded per batch, length-grouped batches,
+#                 class-weighted loss
+#   dynamic_128   the same, truncated to predict_specialist.MAX_LENGTH
+# plus dynamic_128 without class weights, to separate its effect on F1.
+
+
+class LegacyDataset(torch.utils.data.Dataset):
+    """
+    The original train.py dataset
+    """
+
+    def __init__(self, tokenizer, texts, labels):
+        self.encodings = tokenizer(texts, truncation=True, padding=True)
+        self.labels = labels
+
+    def __getitem__(self, idx):
+        item = {k: torch.tensor(v[idx]) for k, v in self.encodings.items()}
+        item["labels"] = torch.tensor(self.labels[idx])
+        return item
+
+    def __len__(self):
+        return len(self.labels)
+
+
+def run(name, tokenizer, splits, label_names, config, epochs, legacy=False, max_length=512, weighted=True):
+    train_texts, val_texts, train_labels, val_labels = splits
+    torch.manual_seed(train.SEED)
+    model = DistilBertForSequenceClassification(config)
+
+    if legacy:
+        train_dataset = LegacyDataset(tokenizer, train_texts, train_labels)
+        val_dataset = LegacyDataset(tokenizer, val_texts, val_labels)
+    else:
+        train_dataset = train.SymptomDataset(tokenizer, train_texts, train_labels, max_length)
+        val_dataset = train.SymptomDataset(tokenizer, val_texts, val_labels, max_length)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        trainer, timer = train.build_trainer(
+            model, tokenizer, train_dataset, val_dataset, label_names,
+            output_dir=tmp,
+            epochs=epochs,
+            group_by_length=not legacy,
+            class_weighting=weighted and not legacy
+        )
+        trainer.train()
+        metrics = trainer.evaluate()
+
+    return {
+        "config": name,
+        "seconds_per_epoch": [round(s, 1) for s in timer.seconds],
+        "accuracy": round(metrics["eval_accuracy"], 4),
+        "macro_f1": round(metrics["eval_macro_f1"], 4),
+        "f1": {k[len("eval_f1_"):]: round(v, 3) for k, v in metrics.items() if k.startswith("eval_f1_")}
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--epochs", type=int, default=1)
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--layers", type=int, default=2)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--configs", nargs="+", default=["legacy", "dynamic_512", "dynamic_128", "dynamic_128_unweighted"])
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    texts, labels, label_map = train.load_dataset()
+    splits = train.split(texts, labels)
+    tokenizer = DistilBertTokenizerFast.from_pretrained(ensure_bench_model())
+    tokenizer.model_max_length = 512    # as distilbert-base-uncased ships
+    config = DistilBertConfig(
+        vocab_size=tokenizer.vocab_size,
+        n_layers=args.layers,
+        dim=args.dim,
+        hidden_dim=args.dim * 4,
+        n_heads=max(1, args.dim // 64),
+        num_labels=len(label_map)
+    )
+
+    configs = {
+        "legacy": dict(legacy=True),
+        "dynamic_512": dict(max_length=512),
+        "dynamic_128": dict(max_length=train.MAX_LENGTH),
+        "dynamic_128_unweighted": dict(max_length=train.MAX_LENGTH, weighted=False)
+    }
+    results = [
+        run(name, tokenizer, splits, list(label_map), config, args.epochs, **configs[name])
+        for name in args.configs
+    ]
+
+    print(f"{'config':<24} {'s/epoch':>9} {'accuracy':>9} {'macro F1':>9}")
+    for r in results:
+        print(f"{r['config']:<24} {sum(r['seconds_per_epoch']) / len(r['seconds_per_epoch']):>9.1f} "
+              f"{r['accuracy']:>9.3f} {r['macro_f1']:>9.3f}")
+    print(json.dumps(results, indent=2))
@@ -0,0 +1,223 @@
+import os
+import re
+import json
+import time
+import resource
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from transformers import DistilBertConfig, DistilBertTokenizerFast, DistilBertForSequenceClassification
+from spatial_index import GridIndex, DEFAULT_CELL_KM
+
+DOCTOR_CSV = "data/clean_doctor_dataset.csv"
+SYMPTOM_CSV = "data/final_symptom_speciality_dataset.csv"
+BENCH_MODEL_DIR = "benchmarks/.model"
+
+# Dwarka, Delhi (same point as patient_input.py)
+PATIENT_LAT = 28.5921
+PATIENT_LNG = 77.0460
+
+
+def load_doctors_scaled(n_rows, seed=0, jitter_deg=0.01):
+    """
+    Tile clean_doctor_dataset.csv up to `n_rows` rows, jittering
+    coordinates by ±`jitter_deg` (0.01 ≈ 1 km) so copies are not
+    exact duplicates.
+    """
+    df = pd.read_csv(DOCTOR_CSV)
+    reps = int(np.ceil(n_rows / len(df)))
+    big = pd.concat([df] * reps, ignore_index=True).iloc[:n_rows].copy()
+
+    rng = np.random.default_rng(seed)
+    big["latitude"] = big["latitude"] + rng.uniform(-jitter_deg, jitter_deg, n_rows)
+    big["longitude"] = big["longitude"] + rng.uniform(-jitter_deg, jitter_deg, n_rows)
+    return big
+
+
+def generate_doctors(n_rows, spread_km=5.0, seed=0):
+    """
+    Synthetic directory of `n_rows` doctors. Each one is placed at a
+    random real doctor's location plus Gaussian noise (sigma `spread_km`)
+    and keeps that doctor's area; speciality, fees, rating and schedule
+    are drawn independently from the real columns.
+    """
+    base = pd.read_csv(DOCTOR_CSV)
+    rng = np.random.default_rng(seed)
+
+    anchor = rng.integers(0, len(base), n_rows)
+    df = base.iloc[anchor].reset_index(drop=True)
+    df["doctor_name"] = [f"Dr Synthetic {i}" for i in range(n_rows)]
+
+    for c in ["speciality", "fees", "rating", "availability_text"]:
+        df[c] = base[c].to_numpy()[rng.integers(0, len(base), n_rows)]
+
+    km_per_deg = 111.19
+    lat = df["latitude"].to_numpy()
+    df["latitude"] = lat + rng.normal(0, spread_km / km_per_deg, n_rows)
+    df["longitude"] = df["longitude"].to_numpy() + rng.normal(
+        0, spread_km / (km_per_deg * np.cos(np.radians(lat))), n_rows
+    )
+    return df
+
+
+def query_stream(n_queries, doctor_df, seed=0):
+    """
+    /recommend-style queries: symptom texts sampled from the symptom
+    dataset, localities from `doctor_df`, typical slider values
+    """
+    rng = np.random.default_rng(seed)
+    symptoms = pd.read_csv(SYMPTOM_CSV)["text"].to_numpy()
+    areas = doctor_df["area"].astype(str).str.lower().str.strip().unique()
+
+    return [
+        {
+            "symptoms": str(symptoms[rng.integers(len(symptoms))]),
+            "location_text": f"{areas[rng.integers(len(areas))]}, delhi",
+            "max_distance_km": int(rng.choice([3, 5, 10])),
+            "max_fees": int(rng.choice([500, 1000, 2000, 5000])),
+            "min_rating": float(rng.choice([0.0, 3.5, 4.0, 4.5]))
+        }
+        for _ in range(n_queries)
+    ]
+
+
+def summarize(seconds):
+    """
+    Latency summary (ms) of a list of per-call timings in seconds
+    """
+    ms = np.asarray(seconds) * 1000
+    if not len(ms):
+        return {"n": 0}
+    return {
+        "n": int(len(ms)),
+        "mean_ms": round(float(ms.mean()), 4),
+        "p50_ms": round(float(np.percentile(ms, 50)), 4),
+        "p95_ms": round(float(np.percentile(ms, 95)), 4),
+        "p99_ms": round(float(np.percentile(ms, 99)), 4),
+        "min_ms": round(float(ms.min()), 4),
+        "max_ms": round(float(ms.max()), 4)
+    }
+
+
+def best_of(fn, repeat=5):
+    """
+    Run `fn` `repeat` times, return (best seconds, last result)
+    """
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def ensure_bench_model(model_dir="model"):
+    """
+    Directory with a DistilBERT classifier for benchmarks.
+
+    Uses the trained `model/` when present; otherwise builds a randomly
+    initialised DistilBERT (same architecture, word-level vocab from the
+    symptom dataset) so latency can be measured fully offline.
+    """
+    if os.path.exists(os.path.join(model_dir, "config.json")):
+        return model_dir
+    if os.path.exists(os.path.join(BENCH_MODEL_DIR, "config.json")):
+        return BENCH_MODEL_DIR
+
+    df = pd.read_csv(SYMPTOM_CSV)
+    label_map = {label: idx for idx, label in enumerate(df["Speciality"].unique())}
+
+    words = sorted({w for t in df["text"] for w in re.findall(r"\w+|[^\w\s]", t.lower())})
+    os.makedirs(BENCH_MODEL_DIR, exist_ok=True)
+    vocab_file = os.path.join(BENCH_MODEL_DIR, "vocab.txt")
+    with open(vocab_file, "w") as f:
+        f.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + words))
+
+    tokenizer = DistilBertTokenizerFast(vocab_file=vocab_file)
+    model = DistilBertForSequenceClassification(
+        DistilBertConfig(vocab_size=len(words) + 5, num_labels=len(label_map))
+    )
+
+    tokenizer.save_pretrained(BENCH_MODEL_DIR)
+    model.save_pretrained(BENCH_MODEL_DIR)
+    with open(os.path.join(BENCH_MODEL_DIR, "label_map.json"), "w") as f:
+        json.dump(label_map, f)
+
+    print(f"⚠️ No trained model in {model_dir}/, benchmarking a random-init DistilBERT")
+    return BENCH_MODEL_DIR
+
+
+def validation_split():
+    """
+    (texts, labels, label_map) of the validation split used in train.py
+    """
+    df = pd.read_csv(SYMPTOM_CSV)
+    label_map = {label: idx for idx, label in enumerate(df["Speciality"].unique())}
+    df["label"] = df["Speciality"].map(label_map)
+
+    _, val_texts, _, val_labels = train_test_split(
+        df["text"].tolist(),
+        df["label"].tolist(),
+        test_size=0.2,
+        random_state=42,
+        stratify=df["label"]
+    )
+    return val_texts, val_labels, label_map
+
+
+def rss_mb():
+    """
+    Peak resident set size of this process (MB)
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# =========================
+# Per-speciality GridIndex over a DataFrame
+# =========================
+# The engine before DoctorStore; kept as the baseline of
+# bench_spatial_index, bench_doctor_store and bench_radius.
+def build_speciality_index(doctor_df, cell_km=DEFAULT_CELL_KM):
+    """
+    {speciality: (row positions in doctor_df, GridIndex)}
+    """
+    index = {}
+    groups = doctor_df.groupby("speciality", sort=False).indices
+
+    for speciality, positions in groups.items():
+        positions = np.sort(positions)
+        index[speciality] = (
+            positions,
+            GridIndex(
+                doctor_df["latitude"].to_numpy()[positions],
+                doctor_df["longitude"].to_numpy()[positions],
+                cell_km=cell_km
+            )
+        )
+
+    return index
+
+
+def query_specialities(index, specialities, lat, lng, radius_km):
+    """
+    Doctors of any of `specialities` within `radius_km`.
+    Returns (row positions in doctor_df, distances_km), in row order.
+    """
+    all_pos, all_dist = [], []
+
+    for speciality in specialities:
+        if speciality not in index:
+            continue
+        positions, grid = index[speciality]
+        pos, dist = grid.query_radius(lat, lng, radius_km)
+        all_pos.append(positions[pos])
+        all_dist.append(dist)
+
+    if not all_pos:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+
+    pos = np.concatenate(all_pos)
+    dist = np.concatenate(all_dist)
+    order = np.argsort(pos, kind="stable")
+    return pos[order], dist[order]
@@ -0,0 +1,211 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import subprocess
+from datetime import datetime, timezone
+
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+
+import api
+import metrics
+import geocode_utils
+import recommend_doctors
+from fastapi.testclient import TestClient
+from doctor_store import DoctorStore, normalize_doctor_df
+from geocode_utils import GeocodeCache, normalize_location
+from predict_specialist import predict_specialist_scored, ml_model
+from result_cache import recommend_cache
+from benchmarks.common import generate_doctors, query_stream, summarize
+
+# =========================
+# End-to-end benchmark suite (JSON output)
+# =========================
+#   python -m benchmarks.suite --doctors 1521 100000 --queries 300 --out before.json
+#   python -m benchmarks.suite --compare before.json after.json
+#
+# Per directory size: a synthetic directory (benchmarks.common.generate_doctors)
+# and a query stream sampled from the symptom dataset, then
+#   predict_specialist   per query (rules, ML fallback if model/ exists)
+#   geocode_location     gazetteer / stub-Nominatim path, then cache hits
+#   recommend_doctors    engine only, plus its per-stage split from metrics.py
+#   e2e_recommend        POST /recommend through the FastAPI app in-process,
+#                        geocoder stubbed, cold result cache then warm
+
+REGRESSION_THRESHOLD = 0.10   # --compare flags p50 slowdowns above 10%
+
+
+def timed_calls(fn, items):
+    samples = []
+    results = []
+    for item in items:
+        start = time.perf_counter()
+        results.append(fn(item))
+        samples.append(time.perf_counter() - start)
+    return samples, results
+
+
+def bench_predict(queries):
+    before = dict(metrics.specialist_decisions._values)
+    samples, specialists = timed_calls(lambda q: list(predict_specialist_scored(q["symptoms"]).candidates), queries)
+
+    sources = {
+        labels[0]: n - before.get(labels, 0)
+        for labels, n in metrics.specialist_decisions._values.items()
+    }
+    return {**summarize(samples), "sources": sources}, specialists
+
+
+def bench_geocode(queries):
+    # stub Nominatim: fixed point, no network
+    geocode_utils._geocode_remote = lambda text: (28.6, 77.1)
+    geocode_utils.geocode_cache = GeocodeCache(db_path=None)
+
+    texts = [q["location_text"] for q in queries]
+    cold, _ = timed_calls(geocode_utils.geocode_location, texts)
+    warm, _ = timed_calls(geocode_utils.geocode_location, texts)
+    return {"cold": summarize(cold), "warm": summarize(warm)}
+
+
+def bench_engine(queries, specialists, point):
+    before = metrics.stage_seconds.totals()
+
+    samples, _ = timed_calls(
+        lambda qs: recommend_doctors.recommend_doctors(
+            qs[0]["symptoms"], point[0], point[1], qs[0]["location_text"],
+            qs[0]["max_distance_km"], qs[0]["max_fees"], qs[0]["min_rating"],
+            specialist=qs[1], limit=10
+        ),
+        list(zip(queries, specialists))
+    )
+
+    stages = {}
+    for (stage,), (count, total) in metrics.stage_seconds.totals().items():
+        count -= before.get((stage,), (0, 0.0))[0]
+        total -= before.get((stage,), (0, 0.0))[1]
+        if count and not stage.startswith(("predict", "total", "geocode", "serialize")):
+            stages[stage] = {"n": count, "mean_ms": round(total / count * 1000, 4)}
+
+    return {**summarize(samples), "stages": stages}
+
+
+def bench_e2e(queries, doctor_df):
+    # stub geocoder: centroid of the typed area in the synthetic directory
+    centroids = doctor_df.groupby("area")[["latitude", "longitude"]].mean()
+    points = {a: (float(r.latitude), float(r.longitude)) for a, r in centroids.iterrows()}
+
+    async def geocode_stub(location_text):
+        return points.get(normalize_location(location_text).split(",")[0].strip(), (None, None))
+
+    api.geocode_location_async = geocode_stub
+    api.WARMUP_ON_STARTUP = False
+    api.WATCH_DOCTOR_CSV = False
+    recommend_cache.clear()
+
+    with TestClient(api.app) as client:
+        def post(q):
+            response = client.post("/recommend", json=q)
+            assert response.status_code == 200, response.text
+            return response
+
+        cold, _ = timed_calls(post, queries)
+        warm, _ = timed_calls(post, queries)
+
+    return {"cold_cache": summarize(cold), "warm_cache": summarize(warm)}
+
+
+def run(sizes, n_queries, spread_km, seed):
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True
+            ).stdout.strip() or None,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "queries": n_queries,
+            "spread_km": spread_km,
+            "seed": seed,
+            "ml_model": ml_model.get() is not None
+        },
+        "results": {}
+    }
+
+    for n in sizes:
+        doctor_df = normalize_doctor_df(generate_doctors(n, spread_km=spread_km, seed=seed))
+        start = time.perf_counter()
+        store = DoctorStore(doctor_df)
+        build_s = time.perf_counter() - start
+        recommend_doctors.doctor_data.set(store)
+
+        queries = query_stream(n_queries, doctor_df, seed=seed)
+        point = (float(doctor_df["latitude"].median()), float(doctor_df["longitude"].median()))
+
+        predict, specialists = bench_predict(queries)
+        report["results"][str(n)] = {
+            "store_build_ms": round(build_s * 1000, 1),
+            "predict_specialist": predict,
+            "geocode_location": bench_geocode(queries),
+            "recommend_doctors": bench_engine(queries, specialists, point),
+            "e2e_recommend": bench_e2e(queries, doctor_df)
+        }
+        print(f"✅ {n:,} doctors done", file=sys.stderr)
+
+    return report
+
+
+# =========================
+# Compare two runs
+# =========================
+def _p50s(results, prefix=""):
+    """
+    {"size/bench/...": p50_ms} for every summary in a results tree
+    """
+    out = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            if "p50_ms" in value:
+                out[prefix + key] = value["p50_ms"]
+            out.update(_p50s(value, prefix + key + "/"))
+    return out
+
+
+def compare(base_path, new_path):
+    with open(base_path) as f:
+        base = _p50s(json.load(f)["results"])
+    with open(new_path) as f:
+        new = _p50s(json.load(f)["results"])
+
+    print(f"{'benchmark':<50} {'base p50':>10} {'new p50':>10} {'change':>8}")
+    regressions = 0
+    for key in sorted(base.keys() & new.keys()):
+        change = new[key] / base[key] - 1 if base[key] else 0.0
+        flag = " ⚠️" if change > REGRESSION_THRESHOLD else ""
+        regressions += bool(flag)
+        print(f"{key:<50} {base[key]:>10.3f} {new[key]:>10.3f} {change * 100:>7.1f}%{flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--doctors", type=int, nargs="+", default=[1521, 100_000])
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--spread-km", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write JSON here (default: stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"))
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare) else 0)
+
+    report = run(args.doctors, args.queries, args.spread_km, args.seed)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from predict_specialist import predict_specialist
+from predict_specialist import predict_specialist_scored
 from recommend_doctors import recommend_doctors
 
 # =========================
@@ -29,7 +29,20 @@ def ask_symptoms():
 # PROCESS SYMPTOMS
 # =========================
 def handle_symptoms(symptoms_text):
-    specialist = predict_specialist(symptoms_text)
+    """
+    Returns (Prediction, bot message)
+    """
+    prediction = predict_specialist_scored(symptoms_text)
+    return prediction, symptoms_response(prediction)
+
+
+def symptoms_response(prediction):
+    """
+    Bot message for a Prediction
+    """
+    # unsure model: name the whole shortlist
+    names = list(prediction.candidates)
+    specialist = names[0] if len(names) == 1 else ", ".join(names[:-1]) + " or " + names[-1]
 
     response = (
         f"Based on your symptoms, you should consult a "
@@ -37,7 +50,7 @@ def handle_symptoms(symptoms_text):
         "Now, please set your preferences."
     )
 
-    return specialist, response
+    return response
 
 
 # =========================
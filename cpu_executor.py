@@ -0,0 +1,61 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# =========================
+# Bounded executor for CPU-bound work
+# =========================
+# Model inference and pandas filtering run here instead of on the event
+# loop. When every worker is busy and the wait queue is full, new work
+# is rejected right away (the API answers 503) instead of piling up.
+
+CPU_WORKERS = 4
+CPU_MAX_PENDING = 64
+
+
+class ExecutorSaturated(Exception):
+    pass
+
+
+class BoundedExecutor:
+    def __init__(self, max_workers=CPU_WORKERS, max_pending=CPU_MAX_PENDING):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="cpu")
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+
+        self._count_lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+
+    async def run(self, fn, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            with self._count_lock:
+                self.rejected += 1
+            raise ExecutorSaturated(f"{self.max_workers + self.max_pending} tasks already queued")
+
+        with self._count_lock:
+            self.in_flight += 1
+        future = self._pool.submit(fn, *args, **kwargs)
+        # the slot frees when the work finishes, even if the caller went away
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, _):
+        with self._count_lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+
+    def stats(self):
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected
+        }
+
+
+cpu_executor = BoundedExecutor()
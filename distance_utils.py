@@ -1,11 +1,13 @@
 import math
+import numpy as np
+
+R = 6371  # Earth radius in km
+
 
 def get_distance_km(lat1, lon1, lat2, lon2):
     """
     Calculate straight-line distance (km) using Haversine formula
     """
-    R = 6371  # Earth radius in km
-
     lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
 
     dlat = lat2 - lat1
@@ -16,3 +18,26 @@ def get_distance_km(lat1, lon1, lat2, lon2):
 
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
     return round(R * c, 2)
+
+
+def get_distances_km(lat, lon, lats, lons, use_float32=False):
+    """
+    Vectorized Haversine: distance (km) from one point to many points.
+
+    `lats` / `lons` are array-likes of equal length. Returns a NumPy
+    array rounded like `get_distance_km`. `use_float32=True` halves the
+    memory traffic for very large directories at ~1e-3 km precision.
+    """
+    dtype = np.float32 if use_float32 else np.float64
+
+    lat1 = np.radians(dtype(lat))
+    lon1 = np.radians(dtype(lon))
+    lat2 = np.radians(np.asarray(lats, dtype=dtype))
+    lon2 = np.radians(np.asarray(lons, dtype=dtype))
+
+    a = np.sin((lat2 - lat1) / 2)**2 + \
+        np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2)**2
+    a = np.clip(a, 0, 1)
+
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return np.round(R * c, 2)
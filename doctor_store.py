@@ -0,0 +1,448 @@
+import os
+import json
+import bisect
+import shutil
+import numpy as np
+import pandas as pd
+from spatial_index import GridIndex, DEFAULT_CELL_KM
+from availability import compile_schedules, is_open, open_fraction
+
+# =========================
+# Columnar in-memory doctor store
+# =========================
+# Rows are grouped by speciality so each speciality is one contiguous
+# slice of every column; inside a slice rows are sorted by area, so all
+# doctors whose area starts with a prefix are one contiguous run. Numeric columns are plain NumPy arrays, text
+# columns are interned (codes + unique values), and a DataFrame is only
+# built for the rows a query actually returns.
+
+# queried columns, always float64 (other numeric columns keep their dtype)
+NUMERIC_COLUMNS = ["latitude", "longitude", "fees", "rating"]
+
+# Binary copy written next to the CSV by preprocess_doctors.py:
+#   data/clean_doctor_dataset.store/   one .npy per array + meta.json
+# Loaded with np.load(mmap_mode="r"), so every worker maps the same
+# page-cache pages instead of parsing and holding its own copy.
+STORE_SUFFIX = ".store"
+STORE_VERSION = 2
+
+
+def normalize_doctor_df(doctor_df):
+    """
+    Normalized column names, lowercased / stripped area and speciality
+    """
+    doctor_df.columns = (
+        doctor_df.columns
+        .str.strip()
+        .str.lower()
+        .str.replace(" ", "_")
+    )
+    doctor_df["area"] = doctor_df["area"].astype(str).str.lower().str.strip()
+    doctor_df["speciality"] = doctor_df["speciality"].astype(str).str.lower().str.strip()
+    return doctor_df
+
+
+def store_path(csv_path):
+    return os.path.splitext(csv_path)[0] + STORE_SUFFIX
+
+
+def _source_signature(csv_path):
+    st = os.stat(csv_path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+class StringTable:
+    """
+    Read-only array of strings kept as one UTF-8 buffer + offsets
+    (mmap-friendly stand-in for an object array of unique values).
+    Indexing with an int returns a str, with an array an object array.
+    """
+
+    def __init__(self, data, offsets, nulls):
+        self.data = data          # uint8
+        self.offsets = offsets    # int64, len(self) + 1
+        self.nulls = nulls        # bool, missing values
+
+    @classmethod
+    def from_values(cls, values):
+        nulls = np.array([pd.isna(v) for v in values], dtype=bool)
+        encoded = [b"" if null else str(v).encode("utf-8") for v, null in zip(values, nulls)]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        return cls(data, offsets, nulls)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def _decode(self, i):
+        if self.nulls[i]:
+            return np.nan
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8")
+
+    def __getitem__(self, index):
+        if np.ndim(index) == 0:
+            return self._decode(int(index))
+        # decode each distinct value once
+        uniques, inverse = np.unique(np.asarray(index), return_inverse=True)
+        decoded = np.empty(len(uniques), dtype=object)
+        decoded[:] = [self._decode(i) for i in uniques.tolist()]
+        return decoded[inverse]
+
+    def __iter__(self):
+        return (self._decode(i) for i in range(len(self)))
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes + self.offsets.nbytes + self.nulls.nbytes
+
+
+class DoctorStore:
+    def __init__(self, doctor_df):
+        # group rows by speciality, then area, keeping dataset order inside
+        order = np.lexsort((
+            np.arange(len(doctor_df)),
+            doctor_df["area"].to_numpy(dtype=str),
+            doctor_df["speciality"].to_numpy(dtype=str)
+        ))
+        df = doctor_df.iloc[order]
+
+        self.columns = list(doctor_df.columns)
+        self.row_ids = df.index.to_numpy()
+        self.n_rows = len(df)
+
+        self.numeric = {
+            c: df[c].to_numpy(dtype=np.float64 if c in NUMERIC_COLUMNS else None)
+            for c in self.columns
+            if c in NUMERIC_COLUMNS or pd.api.types.is_numeric_dtype(df[c])
+        }
+        self.latitude = self.numeric["latitude"]
+        self.longitude = self.numeric["longitude"]
+        self.fees = self.numeric["fees"]
+        self.rating = self.numeric["rating"]
+
+        # every other column: codes into a table of unique values
+        self.codes = {}
+        self.values = {}
+        for c in self.columns:
+            if c in self.numeric:
+                continue
+            codes, uniques = pd.factorize(df[c], use_na_sentinel=False)
+            self.codes[c] = codes.astype(np.int32)
+            self.values[c] = np.asarray(uniques, dtype=object)
+
+        self.area_code = self.codes["area"]
+        self._init_schedules()
+
+        # speciality -> (start, stop) slice and its spatial grid
+        spec_codes = self.codes["speciality"]
+        bounds = np.flatnonzero(np.diff(spec_codes)) + 1
+        starts = np.concatenate([[0], bounds]) if self.n_rows else np.array([], dtype=int)
+        stops = np.concatenate([bounds, [self.n_rows]]) if self.n_rows else np.array([], dtype=int)
+
+        self.slices = {}
+        self.grids = {}
+        self.area_runs = {}
+        for start, stop in zip(starts, stops):
+            name = self.values["speciality"][spec_codes[start]]
+            self.slices[name] = (int(start), int(stop))
+            self.area_runs[name] = self._area_runs(start, stop)
+            self.grids[name] = GridIndex(self.latitude[start:stop], self.longitude[start:stop])
+
+    def _init_schedules(self, schedules=None, unparsed=None):
+        """
+        Weekly bitmap per distinct availability_text (see availability.py);
+        a doctor's schedule is schedules[schedule_code[position]]
+        """
+        self.schedule_code = self.codes.get("availability_text")
+        if self.schedule_code is None:
+            self.schedules, self.unparsed_schedules = None, {}
+        elif schedules is None:
+            self.schedules, self.unparsed_schedules = compile_schedules(list(self.values["availability_text"]))
+        else:
+            self.schedules, self.unparsed_schedules = schedules, unparsed
+
+        self.schedule_open = open_fraction(self.schedules) if self.schedules is not None else None
+
+    def _area_runs(self, start, stop):
+        """
+        (sorted distinct area names, run starts) for one speciality slice;
+        run i covers positions run_starts[i]:run_starts[i + 1]
+        """
+        codes = self.area_code[start:stop]
+        bounds = np.flatnonzero(np.diff(codes)) + 1
+        run_starts = np.concatenate([[0], bounds, [stop - start]]) + start
+        names = [str(self.values["area"][c]) for c in codes[run_starts[:-1] - start]]
+        return names, run_starts
+
+    def same_locations(self, other):
+        """
+        True if `other` has the same rows with the same area, address
+        and coordinates (what the locality gazetteer is built from)
+        """
+        if other is None or self.n_rows != other.n_rows:
+            return False
+        if not (np.array_equal(self.row_ids, other.row_ids) and
+                np.array_equal(self.latitude, other.latitude) and
+                np.array_equal(self.longitude, other.longitude)):
+            return False
+        return all(
+            np.array_equal(self.codes[c], other.codes[c]) and
+            list(self.values[c]) == list(other.values[c])
+            for c in ("area", "address")
+        )
+
+    def __len__(self):
+        return self.n_rows
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    def locality_range(self, speciality, prefix):
+        """
+        (lo, hi) store positions of `speciality` doctors whose area
+        starts with `prefix` (binary search; "" matches every area)
+        """
+        names, run_starts = self.area_runs[speciality]
+        lo = bisect.bisect_left(names, prefix)
+        hi = bisect.bisect_left(names, prefix + "\U0010ffff", lo)
+        return int(run_starts[lo]), int(run_starts[hi])
+
+    def area_range(self, speciality, area):
+        """
+        (lo, hi) store positions of `speciality` doctors in exactly `area`
+        (empty when there are none)
+        """
+        names, run_starts = self.area_runs[speciality]
+        i = bisect.bisect_left(names, area)
+        hi = i + 1 if i < len(names) and names[i] == area else i
+        return int(run_starts[i]), int(run_starts[hi])
+
+    def open_mask(self, positions, slot):
+        """
+        Which doctors at `positions` are open at week slot `slot`
+        """
+        if self.schedules is None:
+            return np.zeros(len(positions), dtype=bool)
+        return is_open(self.schedules, slot)[self.schedule_code[positions]]
+
+    def open_share(self, positions):
+        """
+        Share of the week the doctors at `positions` are open (0 .. 1)
+        """
+        if self.schedules is None:
+            return np.zeros(len(positions))
+        return self.schedule_open[self.schedule_code[positions]]
+
+    def query_radius(self, specialities, lat, lng, radius_km, ranges=None):
+        """
+        Doctors of `specialities` within `radius_km`, optionally only inside
+        `ranges` ({speciality: (lo, hi)} from `locality_range`).
+        Returns (store positions, distances_km) in dataset order.
+        """
+        all_pos, all_dist = [], []
+
+        for speciality in specialities:
+            if speciality not in self.slices:
+                continue
+            start, _ = self.slices[speciality]
+            pos, dist = self.grids[speciality].query_radius(lat, lng, radius_km)
+            pos = pos + start
+
+            if ranges is not None:
+                lo, hi = ranges[speciality]
+                keep = (pos >= lo) & (pos < hi)
+                pos, dist = pos[keep], dist[keep]
+
+            all_pos.append(pos)
+            all_dist.append(dist)
+
+        if not all_pos:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        pos = np.concatenate(all_pos)
+        dist = np.concatenate(all_dist)
+        order = np.argsort(self.row_ids[pos], kind="stable")
+        return pos[order], dist[order]
+
+    # -------------------------
+    # Materialization
+    # -------------------------
+    def materialize(self, positions, **extra):
+        """
+        DataFrame of the given store rows (all dataset columns + `extra`)
+        """
+        data = {}
+        for c in self.columns:
+            if c in self.numeric:
+                data[c] = self.numeric[c][positions]
+            else:
+                data[c] = self.values[c][self.codes[c][positions]]
+
+        df = pd.DataFrame(data, index=self.row_ids[positions])
+        for name, value in extra.items():
+            df[name] = value
+        return df
+
+    # -------------------------
+    # Binary copy (memory-mapped)
+    # -------------------------
+    def save(self, path, source_csv=None):
+        """
+        Write the store as .npy arrays under `path` (replaced atomically).
+        `source_csv` is recorded so a stale copy is ignored on load.
+        """
+        tmp = path + ".tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+
+        arrays = {"row_ids": self.row_ids}
+        for c, a in self.numeric.items():
+            arrays[f"num.{c}"] = a
+        for c, codes in self.codes.items():
+            table = self.values[c]
+            if not isinstance(table, StringTable):
+                table = StringTable.from_values(table)
+            arrays[f"codes.{c}"] = codes
+            arrays[f"str.{c}.data"] = table.data
+            arrays[f"str.{c}.offsets"] = table.offsets
+            arrays[f"str.{c}.nulls"] = table.nulls
+
+        # grids concatenated in slice order: grid i spans the slice's positions
+        names = sorted(self.slices, key=lambda name: self.slices[name][0])
+        grids = [self.grids[name] for name in names]
+        arrays["grid.order"] = np.concatenate([g.order for g in grids]) if grids else np.empty(0, dtype=np.int64)
+        arrays["grid.cells"] = np.concatenate([g.sorted_cells for g in grids]) if grids else np.empty(0, dtype=np.int64)
+        if self.schedules is not None:
+            arrays["schedules"] = self.schedules
+
+        for name, a in arrays.items():
+            np.save(os.path.join(tmp, name + ".npy"), np.ascontiguousarray(a), allow_pickle=False)
+
+        meta = {
+            "version": STORE_VERSION,
+            "columns": self.columns,
+            "numeric": list(self.numeric),
+            "text": list(self.codes),
+            "slices": {name: list(self.slices[name]) for name in names},
+            "cell_km": grids[0].cell_km if grids else DEFAULT_CELL_KM,
+            "unparsed_schedules": self.unparsed_schedules,
+            "source": _source_signature(source_csv) if source_csv else None
+        }
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+        # swap directories; workers still mapping the old files keep them
+        old = path + ".old"
+        shutil.rmtree(old, ignore_errors=True)
+        if os.path.exists(path):
+            os.rename(path, old)
+        os.rename(tmp, path)
+        shutil.rmtree(old, ignore_errors=True)
+        return path
+
+    @classmethod
+    def load(cls, path, mmap_mode="r"):
+        """
+        Store saved by `save`, arrays memory-mapped (read-only)
+        """
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+
+        def array(name):
+            return np.load(os.path.join(path, name + ".npy"), mmap_mode=mmap_mode, allow_pickle=False)
+
+        store = cls.__new__(cls)
+        store.columns = meta["columns"]
+        store.row_ids = array("row_ids")
+        store.n_rows = len(store.row_ids)
+
+        store.numeric = {c: array(f"num.{c}") for c in meta["numeric"]}
+        store.latitude = store.numeric["latitude"]
+        store.longitude = store.numeric["longitude"]
+        store.fees = store.numeric["fees"]
+        store.rating = store.numeric["rating"]
+
+        store.codes = {c: array(f"codes.{c}") for c in meta["text"]}
+        store.values = {
+            c: StringTable(array(f"str.{c}.data"), array(f"str.{c}.offsets"), array(f"str.{c}.nulls"))
+            for c in meta["text"]
+        }
+        store.area_code = store.codes["area"]
+        store._init_schedules(
+            array("schedules") if "availability_text" in store.codes else None,
+            meta["unparsed_schedules"]
+        )
+
+        grid_order = array("grid.order")
+        grid_cells = array("grid.cells")
+
+        store.slices = {}
+        store.grids = {}
+        store.area_runs = {}
+        for name, (start, stop) in meta["slices"].items():
+            store.slices[name] = (start, stop)
+            store.area_runs[name] = store._area_runs(start, stop)
+            store.grids[name] = GridIndex(
+                store.latitude[start:stop],
+                store.longitude[start:stop],
+                cell_km=meta["cell_km"],
+                order=grid_order[start:stop],
+                sorted_cells=grid_cells[start:stop]
+            )
+        return store
+
+    def to_frame(self):
+        """
+        Whole directory as a DataFrame, in dataset order
+        """
+        return self.materialize(np.argsort(self.row_ids, kind="stable"))
+
+    def nbytes(self):
+        """
+        Approximate memory footprint (arrays + interned strings)
+        """
+        total = self.row_ids.nbytes
+        total += sum(a.nbytes for a in self.numeric.values())
+        total += sum(a.nbytes for a in self.codes.values())
+        for values in self.values.values():
+            if isinstance(values, StringTable):
+                total += values.nbytes
+            else:
+                total += values.nbytes + sum(len(str(v)) + 49 for v in values)
+        for grid in self.grids.values():
+            total += grid.order.nbytes + grid.sorted_cells.nbytes
+        if self.schedules is not None:
+            total += self.schedules.nbytes
+        return total
+
+
+def load_cached_store(csv_path):
+    """
+    The saved binary copy of `csv_path`, or None if missing or older
+    than the CSV
+    """
+    path = store_path(csv_path)
+    try:
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    if meta.get("version") != STORE_VERSION or meta.get("source") != _source_signature(csv_path):
+        return None
+    return DoctorStore.load(path)
+
+
+def save_binary_store(csv_path):
+    """
+    Build the store from `csv_path` and write its binary copy next to it
+    """
+    doctor_df = normalize_doctor_df(pd.read_csv(csv_path))
+    return DoctorStore(doctor_df).save(store_path(csv_path), source_csv=csv_path)
+
+
+if __name__ == "__main__":
+    # rebuild the binary copy without re-running preprocess_doctors.py
+    import sys
+    print("✅ Saved", save_binary_store(sys.argv[1] if len(sys.argv) > 1 else "data/clean_doctor_dataset.csv"))
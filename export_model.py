@@ -0,0 +1,56 @@
+import os
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from inference_backends import ONNX_FILE, ONNX_INT8_FILE
+
+# =========================
+# Export the trained classifier for CPU serving
+# =========================
+# Run after train.py:
+#   python export_model.py
+# Writes model/model.onnx (fp32) and model/model_int8.onnx (dynamic INT8).
+# The torch_int8 backend quantizes at load time and needs no export.
+
+MODEL_DIR = "model"
+
+
+def export_onnx(model_dir=MODEL_DIR):
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    model = AutoModelForSequenceClassification.from_pretrained(model_dir)
+    model.eval()
+
+    sample = tokenizer(["chest pain and breathlessness"], return_tensors="pt")
+    path = os.path.join(model_dir, ONNX_FILE)
+
+    torch.onnx.export(
+        model,
+        (sample["input_ids"], sample["attention_mask"]),
+        path,
+        input_names=["input_ids", "attention_mask"],
+        output_names=["logits"],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "attention_mask": {0: "batch", 1: "sequence"},
+            "logits": {0: "batch"}
+        },
+        opset_version=17,
+        dynamo=False
+    )
+    return path
+
+
+def quantize_onnx(model_dir=MODEL_DIR):
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    src = os.path.join(model_dir, ONNX_FILE)
+    dst = os.path.join(model_dir, ONNX_INT8_FILE)
+    quantize_dynamic(src, dst, weight_type=QuantType.QInt8)
+    return dst
+
+
+if __name__ == "__main__":
+    # 1️⃣ fp32 ONNX graph
+    print("✅ Exported", export_onnx())
+
+    # 2️⃣ dynamic INT8 quantization of the ONNX graph
+    print("✅ Quantized", quantize_onnx())
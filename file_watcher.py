@@ -0,0 +1,86 @@
+import os
+import threading
+
+# =========================
+# Poll a file for changes
+# =========================
+# Calls `callback()` from a background thread whenever the file's
+# mtime or size changes. Polling keeps it dependency-free and works on
+# network mounts where inotify does not.
+
+WATCH_INTERVAL = 30   # seconds
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class FileWatcher:
+    def __init__(self, path, callback, interval=WATCH_INTERVAL):
+        self.path = path
+        self.callback = callback
+        self.interval = interval
+
+        self.changes = 0
+        self.errors = 0
+        self.last_error = None
+
+        self._signature = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._signature = _signature(self.path)
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"watch-{os.path.basename(self.path)}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def check(self):
+        """
+        One poll; returns True if the file changed and `callback` ran
+        """
+        signature = _signature(self.path)
+        # a missing file (mid-replace) is not a change; wait for it to reappear
+        if signature is None or signature == self._signature:
+            return False
+
+        self.changes += 1
+        try:
+            self.callback()
+        except Exception as e:
+            # keep the old signature: the next poll retries (the file
+            # may have been caught half-written)
+            self.errors += 1
+            self.last_error = str(e)
+            print(f"⚠️ Reload after change to {self.path} failed:", e)
+        else:
+            self._signature = signature
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def stats(self):
+        return {
+            "path": self.path,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "interval_s": self.interval,
+            "changes": self.changes,
+            "errors": self.errors,
+            "last_error": self.last_error
+        }
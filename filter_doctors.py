@@ -1,10 +1,6 @@
-import pandas as pd
 from predict_specialist import predict_specialist
+from recommend_doctors import get_doctor_df
 
-# =========================
-# Load cleaned doctor dataset
-# =========================
-doctor_df = pd.read_csv("data/clean_doctor_dataset.csv")
 
 def get_doctors_for_patient(symptoms_text):
     """
@@ -17,6 +13,7 @@ def get_doctors_for_patient(symptoms_text):
 
 
     # 🔹 Filter doctors
+    doctor_df = get_doctor_df()
     filtered_doctors = doctor_df[
         doctor_df['speciality'] == specialist
     ]
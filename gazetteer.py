@@ -0,0 +1,237 @@
+import re
+import bisect
+import difflib
+from collections import namedtuple, defaultdict
+import numpy as np
+import pandas as pd
+from lazy_resource import LazyResource
+
+# =========================
+# Offline locality gazetteer
+# =========================
+# Built from the `area` / `address` columns of the doctor dataset:
+# every locality name maps to the centroid of the doctors that mention it.
+
+DOCTOR_CSV = "data/clean_doctor_dataset.csv"
+
+MIN_CONFIDENCE = 0.8        # below this, geocode_utils asks Nominatim
+AMBIGUOUS_SPREAD_KM = 5.0   # names whose doctors spread wider are vague
+MIN_PREFIX_CHARS = 3        # "d" / "dw" are not a locality yet
+
+STOPWORDS = {"near", "opp", "opposite", "behind", "the", "in"}
+TRAILING = {"delhi", "india", "new"}
+
+GazetteerMatch = namedtuple(
+    "GazetteerMatch", ["name", "latitude", "longitude", "confidence"]
+)
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+
+
+def _tokens(text):
+    """
+    Lowercase words without punctuation, stopwords and
+    a trailing "new delhi" / "delhi" / "india".
+    """
+    tokens = [t for t in _PUNCT_RE.sub(" ", str(text).lower()).split() if t not in STOPWORDS]
+    while len(tokens) > 1 and tokens[-1] in TRAILING:
+        tokens.pop()
+    return tokens
+
+
+def _key(text):
+    return " ".join(_tokens(text))
+
+
+def _address_parts(address):
+    """
+    Comma-separated address parts, without the city.
+    """
+    parts = [_key(p) for p in str(address).split(",")]
+    return [p for p in parts if p and p not in TRAILING]
+
+
+def _names(area, address):
+    area_key = _key(area)
+    parts = _address_parts(address)
+
+    names = {area_key, " ".join(parts)}
+    for part in parts:
+        names.add(part)
+        if area_key and area_key not in part:
+            names.add(f"{part} {area_key}")
+
+    return tuple(name for name in names if name)
+
+
+class Gazetteer:
+    """
+    Locality name -> centroid lookup with exact, token-set,
+    prefix and fuzzy matching.
+    """
+
+    def __init__(self, names, latitudes, longitudes, counts, spreads):
+        self.names = list(names)
+        self.latitudes = np.asarray(latitudes, dtype=np.float64)
+        self.longitudes = np.asarray(longitudes, dtype=np.float64)
+        self.counts = np.asarray(counts)
+        self.spreads = np.asarray(spreads, dtype=np.float64)
+
+        self.by_name = {name: i for i, name in enumerate(self.names)}
+        self.sorted_names = sorted(self.names)
+
+        self.by_token_set = {}
+        self.postings = defaultdict(set)
+        for i, name in enumerate(self.names):
+            tokens = frozenset(name.split())
+            # several names can share a token set; keep the best-supported
+            j = self.by_token_set.get(tokens)
+            if j is None or self.counts[i] > self.counts[j]:
+                self.by_token_set[tokens] = i
+            for t in tokens:
+                self.postings[t].add(i)
+
+        self.vocabulary = sorted(self.postings)
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_dataframe(cls, doctor_df):
+        """
+        Names: each area, each full address, each address part and
+        "<address part> <area>" (e.g. "sector 6 dwarka").
+        """
+        rows = []
+        names_of = {}   # many doctors share an (area, address)
+        for area, address, lat, lng in zip(
+            doctor_df["area"],
+            doctor_df["address"],
+            doctor_df["latitude"],
+            doctor_df["longitude"]
+        ):
+            names = names_of.get((area, address))
+            if names is None:
+                names = names_of[(area, address)] = _names(area, address)
+            rows.extend((name, lat, lng) for name in names)
+
+        long_df = pd.DataFrame(rows, columns=["name", "latitude", "longitude"])
+        grouped = long_df.groupby("name", sort=False)
+
+        centroid_lat = grouped["latitude"].transform("mean").to_numpy()
+        centroid_lng = grouped["longitude"].transform("mean").to_numpy()
+        long_df["spread_km"] = np.hypot(
+            (long_df["latitude"].to_numpy() - centroid_lat),
+            (long_df["longitude"].to_numpy() - centroid_lng) * np.cos(np.radians(centroid_lat))
+        ) * 111.19
+
+        table = grouped.agg(
+            latitude=("latitude", "mean"),
+            longitude=("longitude", "mean"),
+            count=("latitude", "size")
+        )
+        table["spread_km"] = long_df.groupby("name", sort=False)["spread_km"].max()
+
+        return cls(
+            table.index,
+            table["latitude"],
+            table["longitude"],
+            table["count"],
+            table["spread_km"]
+        )
+
+    @classmethod
+    def from_csv(cls, csv_path=DOCTOR_CSV):
+        return cls.from_dataframe(
+            pd.read_csv(csv_path, usecols=["area", "address", "latitude", "longitude"])
+        )
+
+    # -------------------------
+    # Matching
+    # -------------------------
+    def _match(self, i, confidence):
+        if self.spreads[i] > AMBIGUOUS_SPREAD_KM:
+            confidence *= 0.6
+        return GazetteerMatch(
+            self.names[i],
+            float(self.latitudes[i]),
+            float(self.longitudes[i]),
+            round(confidence, 3)
+        )
+
+    def lookup(self, location_text):
+        """
+        Best GazetteerMatch for `location_text`, or None.
+        """
+        tokens = _tokens(location_text)
+        # nothing, or only the city ("delhi", "new delhi"): no locality
+        if not tokens or all(t in TRAILING for t in tokens):
+            return None
+        key = " ".join(tokens)
+
+        # 1️⃣ exact name
+        i = self.by_name.get(key)
+        if i is not None:
+            return self._match(i, 1.0)
+
+        # 2️⃣ same words, any order ("dwarka sector 6")
+        i = self.by_token_set.get(frozenset(tokens))
+        if i is not None:
+            return self._match(i, 0.95)
+
+        # 3️⃣ prefix of a known name ("dwar", "sector 6 dw")
+        lo = bisect.bisect_left(self.sorted_names, key)
+        hi = bisect.bisect_right(self.sorted_names, key + "\uffff")
+        if hi > lo and len(key) >= MIN_PREFIX_CHARS:
+            candidates = [self.by_name[n] for n in self.sorted_names[lo:hi]]
+            best = max(candidates, key=lambda c: self.counts[c])
+            return self._match(best, 0.9 if hi - lo == 1 else 0.85)
+
+        # 4️⃣ fuzzy: typo-corrected tokens, best word overlap; words that
+        # match nothing stay in the query, so "dwarka gujarat" only half
+        # overlaps "dwarka"
+        query = set()
+        fuzzy = False
+        for t in tokens:
+            if t not in self.postings:
+                close = difflib.get_close_matches(t, self.vocabulary, n=1, cutoff=0.8)
+                if close:
+                    t = close[0]
+                    fuzzy = True
+            query.add(t)
+
+        known = [t for t in query if t in self.postings]
+        candidates = set().union(*(self.postings[t] for t in known)) if known else set()
+        if not candidates:
+            return None
+
+        def overlap(c):
+            name_tokens = set(self.names[c].split())
+            return len(query & name_tokens) / len(query | name_tokens)
+
+        best = max(candidates, key=lambda c: (overlap(c), self.counts[c]))
+        return self._match(best, overlap(best) * (0.9 if fuzzy else 1.0))
+
+
+# =========================
+# Shared instance (built on first use)
+# =========================
+gazetteer = LazyResource("gazetteer", Gazetteer.from_csv)
+
+
+def get_gazetteer():
+    return gazetteer.get()
+
+
+def lookup_location(location_text):
+    return get_gazetteer().lookup(location_text)
+
+
+# =========================
+# Local Test
+# =========================
+if __name__ == "__main__":
+    g = get_gazetteer()
+    print(f"📍 {len(g)} localities")
+    for q in ["dwarka", "sector 6 dwarka", "Dwarka Sector 6, Delhi", "dwar", "dwrka", "near dwarka mor", "connaught place"]:
+        print(q, "->", g.lookup(q))
@@ -1,6 +1,277 @@
+import re
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+import pandas as pd
 from geopy.geocoders import Nominatim
+from gazetteer import lookup_location, MIN_CONFIDENCE
+from cpu_executor import cpu_executor
+
+USER_AGENT = "ai_medical_bot"
+geolocator = Nominatim(user_agent=USER_AGENT)
+
+# Async client (used by the async API path)
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+GEOCODE_TIMEOUT = 10                # seconds, per call
+GEOCODE_MAX_CONNECTIONS = 100
+
+# =========================
+# CACHE CONFIG
+# =========================
+CACHE_DB = "data/geocode_cache.sqlite"
+MEMORY_CACHE_SIZE = 2048
+CACHE_TTL = 30 * 24 * 3600          # found locations: 30 days
+NEGATIVE_CACHE_TTL = 24 * 3600      # "not found": 1 day
+PURGE_EVERY = 1000                  # writes between expired-row purges
+
+# Offline gazetteer first; Nominatim only for unconfident matches
+USE_GAZETTEER = True
+OFFLINE_ONLY = False
+# a weaker match is no answer ("couldn't understand the location"),
+# not a guess: "sector 12" must not become "sector 6"
+FALLBACK_MIN_CONFIDENCE = 0.5
+
+# only a comma-separated city: "old delhi" / "east delhi" are places
+_SUFFIX_RE = re.compile(r",\s*(new\s+)?delhi(\s*,\s*india)?\s*$")
+
+
+def normalize_location(location_text: str) -> str:
+    """
+    Cache key for a location: lowercase, single spaces,
+    no trailing ", delhi" / ", new delhi" / ", delhi, india"
+    """
+    key = " ".join(location_text.lower().split())
+    key = key.strip(" ,")
+    stripped = _SUFFIX_RE.sub("", key).strip(" ,")
+    return stripped or key
+
+
+class GeocodeCache:
+    """
+    Two-tier geocode cache: in-process LRU in front of a SQLite table.
+
+    Values are (lat, lng); (None, None) is cached as a negative result
+    with a shorter TTL. Safe to share between threadpool workers.
+    """
+
+    def __init__(
+        self,
+        db_path=CACHE_DB,
+        max_memory=MEMORY_CACHE_SIZE,
+        ttl=CACHE_TTL,
+        negative_ttl=NEGATIVE_CACHE_TTL,
+        purge_every=PURGE_EVERY
+    ):
+        self.max_memory = max_memory
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.purge_every = purge_every
+        self._writes = 0
+
+        self._memory = OrderedDict()   # key -> (lat, lng, expires_at)
+        self._lock = threading.Lock()
+
+        self._db = None
+        if db_path:
+            try:
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS geocode ("
+                    "key TEXT PRIMARY KEY, lat REAL, lng REAL, expires_at REAL)"
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                print("⚠️ Geocode disk cache disabled:", e)
+                self._db = None
+
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Returns (found, (lat, lng)). `found` is False on a miss.
+        """
+        with self._lock:
+            tier, latlng = self._lookup(key)
+            if tier == "memory":
+                self.hits_memory += 1
+            elif tier == "disk":
+                self.hits_disk += 1
+            else:
+                self.misses += 1
+            return tier is not None, latlng
+
+    def _lookup(self, key):
+        now = time.time()
+
+        entry = self._memory.get(key)
+        if entry and entry[2] > now:
+            self._memory.move_to_end(key)
+            return "memory", entry[:2]
+
+        if self._db is not None:
+            row = self._db.execute(
+                "SELECT lat, lng, expires_at FROM geocode WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row and row[2] > now:
+                self._remember(key, row)
+                return "disk", row[:2]
+
+        return None, (None, None)
+
+    def set(self, key, latlng):
+        lat, lng = latlng
+        ttl = self.ttl if lat is not None else self.negative_ttl
+        entry = (lat, lng, time.time() + ttl)
+
+        with self._lock:
+            self._remember(key, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO geocode VALUES (?, ?, ?, ?)",
+                    (key, *entry)
+                )
+                self._writes += 1
+                if self.purge_every and self._writes % self.purge_every == 0:
+                    self._purge_expired()
+                self._db.commit()
+
+    def _purge_expired(self):
+        # expired rows are never read again; keep the table bounded
+        self._db.execute("DELETE FROM geocode WHERE expires_at <= ?", (time.time(),))
+
+    def __contains__(self, key):
+        with self._lock:
+            tier, _ = self._lookup(key)
+            return tier is not None
+
+    def _remember(self, key, entry):
+        self._memory[key] = tuple(entry)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory:
+            self._memory.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM geocode")
+                self._db.commit()
+
+    def stats(self):
+        total = self.hits_memory + self.hits_disk + self.misses
+        return {
+            "hits_memory": self.hits_memory,
+            "hits_disk": self.hits_disk,
+            "misses": self.misses,
+            "hit_rate": (self.hits_memory + self.hits_disk) / total if total else 0.0,
+            "memory_entries": len(self._memory)
+        }
+
+
+geocode_cache = GeocodeCache()
+
+
+def _geocode_remote(location_text: str):
+    """
+    Nominatim lookup. Raises on network / service errors.
+    """
+    location = geolocator.geocode(
+        location_text,
+        addressdetails=True,
+        timeout=10
+    )
+
+    if location:
+        return location.latitude, location.longitude
+
+    return None, None
+
+
+async def _geocode_remote_async(location_text: str):
+    """
+    Nominatim lookup over the pooled async client.
+    Raises on network / service errors (including timeouts).
+    """
+    response = await get_async_client().get(
+        NOMINATIM_URL,
+        params={"q": location_text, "format": "json", "limit": 1, "addressdetails": 1}
+    )
+    response.raise_for_status()
+
+    results = response.json()
+    if results:
+        return float(results[0]["lat"]), float(results[0]["lon"])
+
+    return None, None
+
+
+_async_client = None
+
+
+def get_async_client():
+    global _async_client
+    if _async_client is None:
+        import httpx
+
+        _async_client = httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            timeout=GEOCODE_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=GEOCODE_MAX_CONNECTIONS,
+                max_keepalive_connections=GEOCODE_MAX_CONNECTIONS
+            )
+        )
+    return _async_client
+
+
+async def close_async_client():
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+def _gazetteer_answer(location_text: str):
+    """
+    Returns (answer, match). `answer` is set when the offline
+    gazetteer alone decides the result.
+    """
+    match = lookup_location(location_text) if USE_GAZETTEER else None
+
+    if match and match.confidence >= MIN_CONFIDENCE:
+        return (match.latitude, match.longitude), match
+
+    if OFFLINE_ONLY:
+        return _with_fallback((None, None), match), match
+
+    return None, match
+
+
+def _with_fallback(latlng, match):
+    # A weak gazetteer match beats no answer, down to FALLBACK_MIN_CONFIDENCE
+    if latlng[0] is None and match and match.confidence >= FALLBACK_MIN_CONFIDENCE:
+        return match.latitude, match.longitude
+    return latlng
+
+
+def _offline_lookup(location_text: str):
+    """
+    Gazetteer, then cache: (answer, match, key). `answer` is None when
+    Nominatim has to be asked for `key`. Blocking (gazetteer build on
+    first use, fuzzy search, SQLite).
+    """
+    answer, match = _gazetteer_answer(location_text)
+    if answer is not None:
+        return answer, match, None
+
+    key = normalize_location(location_text)
+    found, latlng = geocode_cache.get(key)
+    return (latlng if found else None), match, key
 
-geolocator = Nominatim(user_agent="ai_medical_bot")
 
 def geocode_location(location_text: str):
     """
@@ -10,17 +281,84 @@ def geocode_location(location_text: str):
     if not location_text or not location_text.strip():
         return None, None
 
+    # 1️⃣ Offline gazetteer (no network), then the cache
+    answer, match, key = _offline_lookup(location_text)
+    if answer is not None:
+        return _with_fallback(answer, match)
+
+    # 2️⃣ Nominatim
     try:
-        location = geolocator.geocode(
-            location_text,
-            addressdetails=True,
-            timeout=10
-        )
+        latlng = _geocode_remote(location_text)
+    except Exception as e:
+        # transient failure: do not cache
+        print("Geocoding error:", e)
+        latlng = None, None
+    else:
+        geocode_cache.set(key, latlng)
 
-        if location:
-            return location.latitude, location.longitude
+    return _with_fallback(latlng, match)
 
+
+async def geocode_location_async(location_text: str):
+    """
+    Non-blocking `geocode_location` for async endpoints: the offline
+    part runs on the CPU executor, only the HTTP call on the loop
+    """
+    if not location_text or not location_text.strip():
+        return None, None
+
+    answer, match, key = await cpu_executor.run(_offline_lookup, location_text)
+    if answer is not None:
+        return _with_fallback(answer, match)
+
+    try:
+        latlng = await _geocode_remote_async(location_text)
     except Exception as e:
-        print("Geocoding error:", e)
+        print("Geocoding error:", repr(e))
+        latlng = None, None
+    else:
+        await cpu_executor.run(geocode_cache.set, key, latlng)
 
-    return None, None
+    return _with_fallback(latlng, match)
+
+
+# =========================
+# CACHE PRE-WARM
+# =========================
+def prewarm_geocode_cache(csv_path="data/clean_doctor_dataset.csv", delay=1.0):
+    """
+    Geocode every distinct `area` / `address` of the doctor dataset
+    that is not cached yet. `delay` respects Nominatim's 1 req/s policy.
+    """
+    df = pd.read_csv(csv_path, usecols=["area", "address"])
+    texts = pd.concat([df["area"], df["address"]]).dropna().astype(str).unique()
+
+    warmed = 0
+    for text in texts:
+        key = normalize_location(text)
+        if key in geocode_cache:
+            continue
+        try:
+            geocode_cache.set(key, _geocode_remote(text))
+        except Exception as e:
+            print("Geocoding error:", e)
+            continue
+        warmed += 1
+        if delay:
+            time.sleep(delay)
+
+    print(f"✅ Geocode cache warmed: {warmed} new / {len(texts)} locations")
+    return warmed
+
+
+# =========================
+# Local Test
+# =========================
+if __name__ == "__main__":
+    import sys
+
+    if "--prewarm" in sys.argv:
+        prewarm_geocode_cache()
+    else:
+        print(geocode_location("sector 6 dwarka, delhi"))
+        print(geocode_cache.stats())
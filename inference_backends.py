@@ -0,0 +1,93 @@
+import os
+import numpy as np
+
+# =========================
+# Inference backends for the specialist classifier
+# =========================
+#   torch       fp32 PyTorch (default)
+#   torch_int8  PyTorch with Linear layers dynamically quantized to INT8
+#   onnx        ONNX Runtime, model/model.onnx        (export_model.py)
+#   onnx_int8   ONNX Runtime, model/model_int8.onnx   (export_model.py)
+
+BACKENDS = ["torch", "torch_int8", "onnx", "onnx_int8"]
+
+ONNX_FILE = "model.onnx"
+ONNX_INT8_FILE = "model_int8.onnx"
+
+
+class TorchBackend:
+    def __init__(self, model_dir, quantize=False):
+        import torch
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+        self.torch = torch
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_dir)
+        self.model.eval()
+
+        if quantize:
+            self.model = torch.ao.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+
+    def logits(self, texts, max_length):
+        inputs = self.tokenizer(
+            texts,
+            return_tensors="pt",
+            truncation=True,
+            padding=True,
+            max_length=max_length
+        )
+        with self.torch.no_grad():
+            return self.model(**inputs).logits.numpy()
+
+
+class OnnxBackend:
+    """
+    ONNX Runtime + the standalone `tokenizers` library, so a worker
+    on this backend never imports torch or transformers.
+    """
+
+    def __init__(self, model_dir, filename):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        path = os.path.join(model_dir, filename)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} not found, run export_model.py")
+
+        self.session = ort.InferenceSession(path, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_padding(
+            pad_id=self.tokenizer.token_to_id("[PAD]"),
+            pad_token="[PAD]"
+        )
+        self._max_length = None
+
+    def logits(self, texts, max_length):
+        if max_length != self._max_length:
+            self.tokenizer.enable_truncation(max_length=max_length)
+            self._max_length = max_length
+
+        encodings = self.tokenizer.encode_batch(texts)
+        inputs = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        }
+        feed = {name: inputs[name] for name in self.input_names}
+        return self.session.run(["logits"], feed)[0]
+
+
+def load_backend(name, model_dir):
+    """
+    Backend `name` for the model saved in `model_dir`
+    """
+    if name in ("torch", "torch_int8"):
+        return TorchBackend(model_dir, quantize=name == "torch_int8")
+
+    if name in ("onnx", "onnx_int8"):
+        return OnnxBackend(model_dir, ONNX_FILE if name == "onnx" else ONNX_INT8_FILE)
+
+    raise ValueError(f"Unknown inference backend: {name!r} (expected one of {BACKENDS})")
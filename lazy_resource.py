@@ -0,0 +1,72 @@
+import time
+import threading
+
+# =========================
+# Lazily loaded, thread-safe resource
+# =========================
+NOT_LOADED = "not_loaded"
+LOADING = "loading"
+READY = "ready"
+UNAVAILABLE = "unavailable"   # loader returned None (optional component)
+ERROR = "error"
+
+
+class LazyResource:
+    """
+    Runs `loader()` once, on first `get()` (or an explicit warm-up),
+    and keeps the result. Concurrent callers wait for the same load.
+    """
+
+    def __init__(self, name, loader):
+        self.name = name
+        self.loader = loader
+        self.value = None
+        self.state = NOT_LOADED
+        self.error = None
+        self.load_seconds = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        if self.state in (READY, UNAVAILABLE):
+            return self.value
+
+        with self._lock:
+            if self.state in (READY, UNAVAILABLE):
+                return self.value
+
+            self.state = LOADING
+            start = time.perf_counter()
+            try:
+                value = self.loader()
+            except Exception as e:
+                self.state = ERROR
+                self.error = str(e)
+                raise
+            finally:
+                self.load_seconds = time.perf_counter() - start
+
+            self.value = value
+            self.error = None
+            self.state = READY if value is not None else UNAVAILABLE
+            return value
+
+    def set(self, value):
+        """
+        Replace the loaded value (e.g. after a reload)
+        """
+        with self._lock:
+            self.value = value
+            self.error = None
+            self.state = READY if value is not None else UNAVAILABLE
+
+    def reset(self):
+        with self._lock:
+            self.value = None
+            self.state = NOT_LOADED
+
+    def status(self):
+        return {
+            "state": self.state,
+            "load_ms": round(self.load_seconds * 1000, 1) if self.load_seconds is not None else None,
+            "error": self.error
+        }
@@ -0,0 +1,239 @@
+import os
+import time
+import bisect
+import random
+import cProfile
+import threading
+from contextlib import contextmanager
+
+# =========================
+# In-process metrics (Prometheus text format)
+# =========================
+# Counters and histograms are plain dicts behind a lock: one observation
+# is a perf_counter pair, a bisect and two increments (~1 µs), cheap
+# enough to leave on. GET /metrics renders everything registered here.
+
+# latency buckets (seconds): 50 µs .. 10 s
+DEFAULT_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# Sampled cProfile dumps (also forced per request with "X-Profile: 1",
+# if PROFILE_HEADER_ENABLED: any client can send the header)
+PROFILE_SAMPLE_RATE = 0.0     # fraction of requests, 0 = off
+PROFILE_HEADER_ENABLED = False
+PROFILE_DIR = "profiles"
+PROFILE_MAX_FILES = 100       # newest dumps kept, 0 = unlimited
+
+REGISTRY = []
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    escape = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"')
+    pairs = ",".join(f'{n}="{escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Counter:
+    def __init__(self, name, description, labelnames=()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Gauge:
+    """
+    Value read from `fn()` at render time (cache sizes, hit counts, ...)
+    """
+
+    def __init__(self, name, description, fn):
+        self.name = name
+        self.description = description
+        self.fn = fn
+        REGISTRY.append(self)
+
+    def render(self):
+        return [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} gauge",
+            f"{self.name} {self.fn()}"
+        ]
+
+
+class Histogram:
+    def __init__(self, name, description, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}   # labels -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def observe(self, value, *labels):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[i] += 1
+            series[-1] += value
+
+    def time(self, *labels):
+        """
+        `with histogram.time("stage"):` observes the block's duration
+        """
+        return _Timer(self, labels)
+
+    def count(self, *labels):
+        series = self._series.get(labels)
+        return sum(series[:-1]) if series else 0
+
+    def totals(self):
+        """
+        {labels: (count, sum)} for every series
+        """
+        with self._lock:
+            return {labels: (sum(series[:-1]), series[-1]) for labels, series in self._series.items()}
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+
+        for labels, series in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + ("+Inf",), series[:-1]):
+                cumulative += n
+                le = _labels(self.labelnames + ("le",), labels + (bound,))
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            base = _labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{base} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{base} {cumulative}")
+        return lines
+
+
+class _Timer:
+    # plain class: cheaper per use than a @contextmanager generator
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+        return False
+
+
+def render():
+    """
+    All registered metrics in the Prometheus text exposition format
+    """
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# =========================
+# /recommend pipeline metrics
+# =========================
+stage_seconds = Histogram(
+    "recommend_stage_seconds",
+    "Time spent per /recommend pipeline stage",
+    labelnames=("stage",)
+)
+specialist_decisions = Counter(
+    "specialist_decisions_total",
+    "Specialist predictions by source (rule, tfidf, model, ..._low_confidence, default)",
+    labelnames=("source",)
+)
+radius_used = Counter(
+    "recommend_radius_km_total",
+    "Search radius the auto-expansion settled on",
+    labelnames=("radius_km",)
+)
+empty_results = Counter(
+    "recommend_empty_total",
+    "Requests that returned no doctors, by reason",
+    labelnames=("reason",)
+)
+profiles_written = Counter("recommend_profiles_total", "cProfile dumps written")
+
+
+# =========================
+# Sampled profiling
+# =========================
+# cProfile can only run one profiler at a time on newer Pythons, so a
+# request that would overlap another profiled one is simply not profiled.
+_profile_lock = threading.Lock()
+
+
+def should_profile(forced=False):
+    """
+    `forced` is a client's request for a dump; honoured only
+    with PROFILE_HEADER_ENABLED
+    """
+    if forced and PROFILE_HEADER_ENABLED:
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def _prune_profiles(keep):
+    paths = [os.path.join(PROFILE_DIR, f) for f in os.listdir(PROFILE_DIR) if f.endswith(".prof")]
+    paths.sort(key=os.path.getmtime)
+    for path in paths[:-keep]:
+        os.remove(path)
+
+
+@contextmanager
+def profiled(enabled, name="recommend"):
+    """
+    Profile the block into PROFILE_DIR/<name>-<timestamp>.prof if `enabled`,
+    keeping the newest PROFILE_MAX_FILES dumps
+    """
+    if not enabled or not _profile_lock.acquire(blocking=False):
+        yield None
+        return
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f"{name}-{time.time_ns()}.prof")
+        profiler.dump_stats(path)
+        profiles_written.inc()
+        if PROFILE_MAX_FILES:
+            _prune_profiles(PROFILE_MAX_FILES)
+    finally:
+        _profile_lock.release()
@@ -1,73 +1,317 @@
-import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+import os
+import re
+import json
+import time
+import asyncio
+from collections import namedtuple
+import numpy as np
+from ttl_cache import TTLCache
+from batch_inference import MicroBatcher
+from cpu_executor import cpu_executor
+from specialist_rules import rule_table
+from lazy_resource import LazyResource
+from tfidf_classifier import TfidfClassifier
+from metrics import stage_seconds, specialist_decisions
 
 # =========================
 # SAFE DEPLOY CONFIG
 # =========================
 MODEL_DIR = "model"
+LABEL_MAP_FILE = "label_map.json"   # written by train.py: {speciality: class index}
+MAX_LENGTH = 128
+
+DEFAULT_SPECIALIST = "General Medicine"
+
+# Model answers below this softmax confidence are not trusted; they
+# become DEFAULT_SPECIALIST ("default") or the top ML_SHORTLIST_SIZE
+# specialities, searched together ("shortlist")
+ML_MIN_CONFIDENCE = 0.5
+ML_LOW_CONFIDENCE = "shortlist"
+ML_SHORTLIST_SIZE = 3
+
+# Character n-gram TF-IDF tier (train_tfidf.py), tried before the
+# transformer; answers below TFIDF_MIN_CONFIDENCE are escalated to it
+USE_TFIDF = True
+TFIDF_MODEL_PATH = "model_tfidf/classifier.npz"
+TFIDF_MIN_CONFIDENCE = 0.8
+
+# Micro-batching of concurrent ML fallback requests. Off: on CPU a
+# padded batch costs as much per text as single passes (see
+# benchmarks/bench_batch_inference.py), so batching only adds the wait
+ML_BATCHING = False
+ML_MAX_BATCH_SIZE = 16
+ML_MAX_WAIT_MS = 5
+
+# Memoized predictions, keyed on normalize_symptoms(text)
+SPECIALIST_CACHE_SIZE = 4096
+SPECIALIST_CACHE_TTL = 24 * 3600    # seconds
+
+# torch | torch_int8 | onnx | onnx_int8 (see inference_backends.py)
+INFERENCE_BACKEND = "torch"
+
+# Backends import torch / onnxruntime on first use, not at import time
+model = None         # inference backend (tokenizer + model)
+label_names = None   # class index -> speciality
+
+# specialist: best answer; confidence: 1.0 for rules, softmax probability
+# for the model, None for the default; candidates: specialities to search
+Prediction = namedtuple("Prediction", ["specialist", "confidence", "candidates"])
+
+
+def load_label_names(model_dir):
+    """
+    Class index -> speciality, from train.py's label map
+    """
+    with open(os.path.join(model_dir, LABEL_MAP_FILE)) as f:
+        label_map = json.load(f)
+
+    names = [None] * len(label_map)
+    for name, idx in label_map.items():
+        names[idx] = name
+    return names
 
-tokenizer = None
-model = None
 
 def load_ml_model():
-    global tokenizer, model
+    global model, label_names
+    if not os.path.isdir(MODEL_DIR):
+        # avoid transformers treating MODEL_DIR as a Hub repo id
+        model = None
+        print("⚠️ ML model not found, using rule-based only")
+        return None
+
     try:
-        tokenizer = AutoTokenizer.from_pretrained(MODEL_DIR)
-        model = AutoModelForSequenceClassification.from_pretrained(MODEL_DIR)
-        model.eval()
-        print("✅ ML model loaded")
+        from inference_backends import load_backend
+
+        # without the label map the class indexes match no speciality
+        label_names = load_label_names(MODEL_DIR)
+        model = load_backend(INFERENCE_BACKEND, MODEL_DIR)
+        print(f"✅ ML model loaded ({INFERENCE_BACKEND})")
+        return model
     except Exception as e:
-        tokenizer = None
         model = None
-        print("⚠️ ML model not found, using rule-based only")
+        print(f"⚠️ ML model not loaded ({e}), using rule-based only")
+        return None
+
+
+ml_model = LazyResource("model", load_ml_model)
 
-load_ml_model()
+
+def load_tfidf_model():
+    if not USE_TFIDF or not os.path.exists(TFIDF_MODEL_PATH):
+        return None
+
+    try:
+        tfidf = TfidfClassifier.load(TFIDF_MODEL_PATH)
+        print(f"✅ TF-IDF classifier loaded ({len(tfidf.terms)} features)")
+        return tfidf
+    except Exception as e:
+        print(f"⚠️ TF-IDF classifier not loaded ({e})")
+        return None
+
+
+tfidf_model = LazyResource("tfidf_model", load_tfidf_model)
+
+# =========================
+# Prediction cache
+# =========================
+# One chat session classifies the same text twice (/symptoms, then
+# /recommend), so the Prediction is kept per normalized text.
+# Defaults are not cached: they are free, and the
+# model may still be loading.
+_PUNCTUATION_RE = re.compile(r"[\W_]+")
+
+
+def normalize_symptoms(symptoms_text: str) -> str:
+    """
+    Cache key / classifier input: lowercase, punctuation replaced by
+    spaces, single spaces. Rule keywords are plain words, so rule
+    matches are unchanged.
+    """
+    return _PUNCTUATION_RE.sub(" ", symptoms_text.lower()).strip()
+
+
+specialist_cache = TTLCache(maxsize=SPECIALIST_CACHE_SIZE, ttl=SPECIALIST_CACHE_TTL)
+
+# =========================
+# Rule-based classifier
+# =========================
+def predict_by_rules(text: str):
+    """
+    Returns the specialist for normalize_symptoms() `text`, or None
+    if no rule fires
+    """
+    match = rule_table.match_words(text.split())
+    return match.specialist if match else None
+
+
+# =========================
+# ML inference (batched)
+# =========================
+def _ml_predict(texts):
+    """
+    One padded forward pass over `texts`; a Prediction per text
+    """
+    logits = model.logits(texts, MAX_LENGTH)
+
+    exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return _decode(exp / exp.sum(axis=1, keepdims=True), label_names)
+
+
+def _decode(probs, names):
+    """
+    Predictions from class probabilities (one row per text), with the
+    ML_MIN_CONFIDENCE / ML_LOW_CONFIDENCE fallback applied
+    """
+    ranked = np.argsort(-probs, axis=1, kind="stable")[:, :ML_SHORTLIST_SIZE]
+
+    predictions = []
+    for row, top in zip(probs, ranked):
+        best = names[top[0]]
+        confidence = float(row[top[0]])
+
+        if confidence >= ML_MIN_CONFIDENCE:
+            predictions.append(Prediction(best, confidence, (best,)))
+        elif ML_LOW_CONFIDENCE == "shortlist":
+            predictions.append(Prediction(best, confidence, tuple(names[i] for i in top)))
+        else:
+            predictions.append(Prediction(DEFAULT_SPECIALIST, confidence, (DEFAULT_SPECIALIST,)))
+    return predictions
+
+
+ml_batcher = MicroBatcher(
+    _ml_predict,
+    max_batch_size=ML_MAX_BATCH_SIZE,
+    max_wait_ms=ML_MAX_WAIT_MS
+)
 
 # =========================
 # Prediction function
 # =========================
 def predict_specialist(symptoms_text: str) -> str:
-    text = symptoms_text.lower().strip()
+    return predict_specialist_scored(symptoms_text)[0]
 
-    # -------------------------
-    # RULE-BASED (PRIMARY)
-    # -------------------------
-    if any(w in text for w in ["joint", "knee", "bone", "arthritis"]):
-        return "Orthopedics"
 
-    if any(w in text for w in ["skin", "rash", "itch", "acne"]):
-        return "Dermatology"
+def predict_specialist_scored(symptoms_text: str) -> Prediction:
+    """
+    Prediction for `symptoms_text`: rules, then the TF-IDF tier, then
+    the transformer. `.candidates` has more than one speciality when
+    the classifier was unsure (ML_LOW_CONFIDENCE = "shortlist").
+    """
+    start = time.perf_counter()
+    text = normalize_symptoms(symptoms_text)
+
+    prediction = _predict_before_model(text, start)
+    if prediction is not None:
+        return prediction
+
+    prediction = ml_batcher(text) if ML_BATCHING else _ml_predict([text])[0]
+    return _model_decided(prediction, start, text)
 
-    if any(w in text for w in ["chest", "heart", "palpitation"]):
-        return "Cardiology"
 
-    if any(w in text for w in ["headache", "migraine", "seizure"]):
-        return "Neurology"
+async def predict_specialist_async(symptoms_text: str) -> Prediction:
+    """
+    Non-blocking `predict_specialist_scored` for async endpoints: the
+    cheap tiers run on the CPU executor; a request waiting on the
+    micro-batcher holds no executor slot, so batches can fill up
+    """
+    start = time.perf_counter()
+    text = normalize_symptoms(symptoms_text)
 
-    if any(w in text for w in ["fever", "vomiting", "cold", "weakness", "fatigue"]):
-        return "General Medicine"
+    prediction = await cpu_executor.run(_predict_before_model, text, start)
+    if prediction is not None:
+        return prediction
+
+    if ML_BATCHING:
+        prediction = await asyncio.wrap_future(ml_batcher.submit(text))
+    else:
+        prediction = (await cpu_executor.run(_ml_predict, [text]))[0]
+    return _model_decided(prediction, start, text)
+
+
+def _predict_before_model(text, start):
+    """
+    Cache, rules, TF-IDF tier; the Prediction, or None when the
+    transformer (loaded here on first use) has to decide
+    """
+    cached = specialist_cache.get(text)
+    if cached is not None:
+        stage_seconds.observe(time.perf_counter() - start, "predict_cache")
+        return cached
+
+    # -------------------------
+    # RULE-BASED (PRIMARY)
+    # -------------------------
+    specialist = predict_by_rules(text)
+    if specialist:
+        return _decided("rule", Prediction(specialist, 1.0, (specialist,)), start, text)
+
+    # -------------------------
+    # TF-IDF TIER (OPTIONAL, ~0.1 ms)
+    # -------------------------
+    tfidf = tfidf_model.get()
+    if tfidf is not None:
+        prediction = _decode(tfidf.predict_proba([text]), tfidf.labels)[0]
+        if prediction.confidence >= TFIDF_MIN_CONFIDENCE:
+            return _decided("tfidf", prediction, start, text)
 
     # -------------------------
     # ML FALLBACK (OPTIONAL)
     # -------------------------
-    if tokenizer and model:
-        inputs = tokenizer(
-            text,
-            return_tensors="pt",
-            truncation=True,
-            padding=True,
-            max_length=128
-        )
-        with torch.no_grad():
-            outputs = model(**inputs)
-            predicted_class = torch.argmax(outputs.logits, dim=1).item()
-
-        return str(predicted_class)
+    if ml_model.get() is not None:
+        return None
+
+    # no transformer: the unsure TF-IDF answer, gated like the model's
+    if tfidf is not None:
+        source = "tfidf" if prediction.confidence >= ML_MIN_CONFIDENCE else "tfidf_low_confidence"
+        return _decided(source, prediction, start, text)
 
     # -------------------------
     # SAFE DEFAULT
     # -------------------------
-    return "General Medicine"
+    return _decided("default", Prediction(DEFAULT_SPECIALIST, None, (DEFAULT_SPECIALIST,)), start)
+
+
+def _model_decided(prediction, start, text):
+    source = "model" if prediction.confidence >= ML_MIN_CONFIDENCE else "model_low_confidence"
+    return _decided(source, prediction, start, text)
+
+
+def _decided(source, prediction, start, cache_key=None):
+    specialist_decisions.inc(source)
+    stage_seconds.observe(time.perf_counter() - start, f"predict_{source}")
+    if cache_key is not None:
+        specialist_cache.set(cache_key, prediction)
+    return prediction
+
+
+def predict_specialist_batch(texts, batch_size=32):
+    """
+    Offline / bulk version of `predict_specialist`: rules per text,
+    the TF-IDF tier on rule misses, then what it is unsure of through
+    the transformer in padded batches
+    """
+    texts = [normalize_symptoms(t) for t in texts]
+    results = [predict_by_rules(t) for t in texts]
+
+    misses = [i for i, r in enumerate(results) if r is None]
+
+    tfidf = tfidf_model.get()
+    if misses and tfidf is not None:
+        predictions = _decode(tfidf.predict_proba([texts[i] for i in misses]), tfidf.labels)
+        unsure = []
+        for i, prediction in zip(misses, predictions):
+            results[i] = prediction.specialist
+            if prediction.confidence < TFIDF_MIN_CONFIDENCE:
+                unsure.append(i)
+        misses = unsure
+
+    if misses and ml_model.get() is not None:
+        for start in range(0, len(misses), batch_size):
+            chunk = misses[start:start + batch_size]
+            for i, prediction in zip(chunk, _ml_predict([texts[i] for i in chunk])):
+                results[i] = prediction.specialist
+
+    return [r or DEFAULT_SPECIALIST for r in results]
 
 
 # =========================
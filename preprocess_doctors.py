@@ -1,17 +1,30 @@
+import os
+import argparse
+import numpy as np
 import pandas as pd
+from doctor_store import DoctorStore, normalize_doctor_df, store_path
 
 # =========================
-# 1. Load doctor dataset
+# Doctor directory preprocessing pipeline
 # =========================
-df = pd.read_excel("data/doctor_dataset.xlsx")
+#   python preprocess_doctors.py                              # full rebuild from the Excel sheet
+#   python preprocess_doctors.py --input feed.csv --incremental
+#
+# Streams the raw feed (CSV or Excel) in chunks, cleans each chunk with
+# vectorized pandas ops, rejects invalid rows into data/rejected_doctors.csv
+# (with the source row number and reason), de-duplicates doctors on a
+# stable key and writes clean_doctor_dataset.csv + its binary store
+# (availability strings compiled to weekly bitmaps; unparsed ones are reported).
+# --incremental merges the feed into the existing clean dataset: rows
+# with a known key are updated in place, new keys are appended, doctors
+# absent from the feed are kept.
 
-print("Original Columns:")
-print(df.columns)
+RAW_PATH = "data/doctor_dataset.xlsx"
+CLEAN_CSV = "data/clean_doctor_dataset.csv"
+REJECTS_CSV = "data/rejected_doctors.csv"
+CHUNK_SIZE = 100_000
 
-# =========================
-# 2. Rename columns (standard ML-friendly names)
-# =========================
-df.rename(columns={
+COLUMN_MAP = {
     'Doctor / Clinic Name': 'doctor_name',
     'Speciality': 'speciality',
     'Area': 'area',
@@ -21,55 +34,238 @@ df.rename(columns={
     'Rating': 'rating',
     'Availability': 'availability',
     'Contact Number': 'contact',
-    'Address': 'address'
-}, inplace=True)
+    'Address': 'address',
+    # feeds already in the clean layout
+    'availability_text': 'availability'
+}
 
-# =========================
-# 3. Remove unwanted Excel columns
-# =========================
-df = df.loc[:, ~df.columns.str.contains('unnamed', case=False)]
+CLEAN_COLUMNS = [
+    'doctor_name', 'speciality', 'area', 'latitude', 'longitude', 'fees',
+    'rating', 'contact', 'address', 'availability_text', 'availability_flag'
+]
 
-# =========================
-# 4. Clean text columns
-# =========================
-df['speciality'] = df['speciality'].str.lower().str.strip()
-df['area'] = df['area'].str.lower().str.strip()
+# same doctor = same name, speciality and address (case / spacing ignored)
+KEY_COLUMNS = ['doctor_name', 'speciality', 'address']
 
-# =========================
-# 5. Handle missing numeric values
-# =========================
-df['fees'] = df['fees'].fillna(df['fees'].median())
-df['rating'] = df['rating'].fillna(df['rating'].median())
 
 # =========================
-# 6. AVAILABILITY (IMPORTANT PART 🔥)
+# 1. Stream the raw feed
 # =========================
-# Keep original availability text for patient display
-df['availability_text'] = df['availability']
+def _read_excel_chunks(path, chunk_size):
+    from openpyxl import load_workbook
 
-# Create binary flag for ML (1 = available, 0 = not available)
-df['availability_flag'] = df['availability'].apply(
-    lambda x: 0 if pd.isna(x) or str(x).strip() == "" else 1
-)
+    # read-only workbooks keep the file open until closed
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(h) if h is not None else "Unnamed" for h in next(rows)]
 
-# Drop original availability column
-df.drop(columns=['availability'], inplace=True)
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == chunk_size:
+                yield pd.DataFrame(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header)
+    finally:
+        workbook.close()
+
+
+def read_chunks(path, chunk_size=CHUNK_SIZE):
+    """
+    Raw feed in DataFrame chunks, each with a `source_row` column
+    (1-based data row in the input file)
+    """
+    if path.lower().endswith((".xlsx", ".xlsm")):
+        chunks = _read_excel_chunks(path, chunk_size)
+    else:
+        chunks = pd.read_csv(path, chunksize=chunk_size)
+
+    offset = 0
+    for chunk in chunks:
+        chunk["source_row"] = np.arange(offset + 1, offset + len(chunk) + 1)
+        offset += len(chunk)
+        yield chunk
 
-# =========================
-# 7. Drop rows without location
-# =========================
-df = df.dropna(subset=['latitude', 'longitude'])
 
 # =========================
-# 8. Convert datatypes
+# 2. Clean + validate one chunk (vectorized)
 # =========================
-df['fees'] = df['fees'].astype(float)
-df['rating'] = df['rating'].astype(float)
-df['availability_flag'] = df['availability_flag'].astype(int)
+def _map_unique(series, fn):
+    """
+    `fn` (Series -> Series) applied once per distinct value: areas,
+    specialities and addresses repeat across thousands of rows
+    """
+    codes, uniques = pd.factorize(series)
+    mapped = fn(pd.Series(uniques, dtype="string")).array
+    return pd.Series(mapped.take(codes, allow_fill=True), index=series.index, dtype="string")
+
+
+def clean_chunk(df):
+    """
+    Returns (clean rows, rejected rows with an `error` column)
+    """
+    # Rename columns (standard ML-friendly names) and drop Excel leftovers
+    df = df.rename(columns=COLUMN_MAP)
+    df = df.loc[:, ~df.columns.str.contains('unnamed', case=False)]
+
+    # Clean text columns
+    for c in ['doctor_name', 'contact', 'address']:
+        df[c] = _map_unique(df[c], lambda s: s.str.strip())
+    for c in ['speciality', 'area']:
+        df[c] = _map_unique(df[c], lambda s: s.str.lower().str.strip())
+
+    # Numbers: unparseable cells become NaN and are reported below
+    for c in ['latitude', 'longitude', 'fees', 'rating']:
+        df[c] = pd.to_numeric(df[c], errors='coerce')
+
+    # AVAILABILITY: original text for display + binary flag for ML
+    availability = df['availability'].astype("string")
+    df['availability_text'] = df['availability']
+    df['availability_flag'] = (availability.str.strip().fillna("") != "").astype(int)
+
+    # Per-row validation (first failing rule is reported)
+    errors = pd.Series(pd.NA, index=df.index, dtype="string")
+    checks = [
+        (df['doctor_name'].isna() | (df['doctor_name'] == ""), "missing doctor_name"),
+        (df['speciality'].isna() | (df['speciality'] == ""), "missing speciality"),
+        (df['area'].isna() | (df['area'] == ""), "missing area"),
+        (df['latitude'].isna() | df['longitude'].isna(), "missing or invalid coordinates"),
+        (~df['latitude'].between(-90, 90) | ~df['longitude'].between(-180, 180), "coordinates out of range"),
+        (df['fees'] < 0, "negative fees"),
+        (~df['rating'].between(0, 5) & df['rating'].notna(), "rating outside 0-5"),
+    ]
+    for failed, reason in checks:
+        errors = errors.mask(errors.isna() & failed.fillna(False).astype(bool), reason)
+
+    bad = errors.notna().to_numpy()
+    rejected = df.loc[bad].assign(error=errors[bad])
+    return df.loc[~bad, CLEAN_COLUMNS + ['source_row']], rejected
+
+
+def doctor_keys(df):
+    """
+    Stable 64-bit key per row from KEY_COLUMNS (normalized)
+    """
+    keys = np.zeros(len(df), dtype=np.uint64)
+    for c in KEY_COLUMNS:
+        codes, uniques = pd.factorize(df[c])
+        # normalize + hash each distinct value once; code -1 (missing) -> ""
+        normalized = np.array([" ".join(str(v).lower().split()) for v in uniques] + [""], dtype=object)
+        keys = keys * np.uint64(1_000_003) ^ pd.util.hash_array(normalized)[codes]
+    return keys
+
+
+def _as_text(df):
+    # comparable cell values: missing -> "", everything else via str()
+    return df.astype(object).where(df.notna(), "").astype(str).to_numpy()
+
+
+def finalize(df):
+    """
+    Fill missing fees / rating with the median and fix dtypes
+    """
+    df['fees'] = df['fees'].fillna(df['fees'].median()).astype(float)
+    df['rating'] = df['rating'].fillna(df['rating'].median()).astype(float)
+    df['availability_flag'] = df['availability_flag'].astype(int)
+    return df
+
 
 # =========================
-# 9. Save cleaned dataset
+# 3. Pipeline
 # =========================
-df.to_csv("data/clean_doctor_dataset.csv", index=False)
+def run_pipeline(input_path=RAW_PATH, output_csv=CLEAN_CSV, rejects_csv=REJECTS_CSV,
+                 incremental=False, chunk_size=CHUNK_SIZE):
+    """
+    Clean `input_path` into `output_csv` (+ binary store);
+    returns a summary dict
+    """
+    # rejects are this run's only: no stale file from an earlier feed
+    if os.path.exists(rejects_csv):
+        os.remove(rejects_csv)
+
+    feed, keys = None, np.empty(0, dtype=np.uint64)
+    n_input = n_clean = n_rejected = 0
+    for chunk in read_chunks(input_path, chunk_size):
+        n_input += len(chunk)
+        ok, bad = clean_chunk(chunk)
+
+        if len(bad):
+            bad.to_csv(rejects_csv, mode="a", header=not n_rejected, index=False)
+            n_rejected += len(bad)
+
+        # De-duplicate as chunks arrive: a later row for the same doctor wins
+        n_clean += len(ok)
+        feed = pd.concat([feed, ok.drop(columns='source_row')], ignore_index=True)
+        keys = np.concatenate([keys, doctor_keys(ok)])
+        last = ~pd.Series(keys).duplicated(keep="last").to_numpy()
+        feed, keys = feed.loc[last].reset_index(drop=True), keys[last]
+
+    summary = {
+        "input_rows": n_input,
+        "rejected": n_rejected,
+        "duplicates": n_clean - len(feed)
+    }
+
+    if incremental and os.path.exists(output_csv):
+        existing = pd.read_csv(output_csv)
+        existing_keys = doctor_keys(existing)
+
+        position = pd.Series(np.arange(len(existing)), index=existing_keys)
+        position = position[~position.index.duplicated(keep="last")]
+        found = position.reindex(keys).to_numpy()
+        known = ~np.isnan(found)
+
+        # only rows whose content differs count as (and are written as) updates
+        updates = feed.loc[known].set_axis(found[known].astype(np.int64))
+        current = existing.loc[updates.index, CLEAN_COLUMNS]
+        changed = ~(_as_text(updates[CLEAN_COLUMNS]) == _as_text(current)).all(axis=1)
+        for c in CLEAN_COLUMNS:
+            existing.loc[updates.index[changed], c] = updates.loc[changed, c].to_numpy()
+
+        added = feed.loc[~known]
+        df = pd.concat([existing, added], ignore_index=True)
+        summary.update(
+            added=len(added),
+            updated=int(changed.sum()),
+            unchanged=int((~changed).sum())
+        )
+        if not len(added) and not changed.any():
+            summary["rows"] = len(existing)
+            summary["written"] = False
+            return summary
+    else:
+        df = feed.reset_index(drop=True)
+
+    df = finalize(df[CLEAN_COLUMNS])
+
+    # Save cleaned dataset (atomic replace: the API may be watching it)
+    tmp = output_csv + ".tmp"
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, output_csv)
+
+    # Binary copy for the API (memory-mapped by every worker);
+    # availability schedules are compiled here, once
+    store = DoctorStore(normalize_doctor_df(df))
+    store.save(store_path(output_csv), source_csv=output_csv)
+
+    summary["rows"] = len(df)
+    summary["unparsed_availability"] = store.unparsed_schedules
+    summary["written"] = True
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input", default=RAW_PATH)
+    parser.add_argument("--output", default=CLEAN_CSV)
+    parser.add_argument("--rejects", default=REJECTS_CSV)
+    parser.add_argument("--incremental", action="store_true")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
 
-print("✅ STEP 1 COMPLETE: clean_doctor_dataset.csv created successfully")
+    summary = run_pipeline(args.input, args.output, args.rejects, args.incremental, args.chunk_size)
+    for text, error in summary.pop("unparsed_availability", {}).items():
+        print(f"⚠️ Unparsed availability {text!r}: {error}")
+    print("✅ Preprocessing complete:", summary)
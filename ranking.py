@@ -0,0 +1,155 @@
+from collections import namedtuple
+import numpy as np
+
+# =========================
+# Ranking profiles
+# =========================
+# A criterion maps the candidate set to scores in [0, 1] (higher is
+# better); a profile weights criteria, score = sum(weight * criterion).
+# Everything is a handful of vector ops over the candidates, then the
+# best page by partial selection (top_k_order), so the cost does not
+# depend on the profile and grows only linearly with candidates.
+#
+# "rating" is the original order: rating desc, then distance asc.
+
+MAX_RATING = 5.0
+
+# One /recommend query's candidates (parallel arrays) and its filters
+Candidates = namedtuple("Candidates", [
+    "store",         # DoctorStore
+    "positions",     # store positions
+    "distance_km",
+    "radius_km",     # radius the auto-expansion settled on
+    "max_fees",
+    "locality",      # typed area (lowercase), "" for none
+    "specialities"   # store specialities the candidates come from
+])
+
+
+def _distance(c):
+    return 1.0 - c.distance_km / c.radius_km
+
+
+def _rating(c):
+    return c.store.rating[c.positions] / MAX_RATING
+
+
+def _fees(c):
+    # share of the patient's budget left over
+    if c.max_fees <= 0:
+        return np.zeros(len(c.positions))
+    return 1.0 - np.clip(c.store.fees[c.positions] / c.max_fees, 0.0, 1.0)
+
+
+def _availability(c):
+    # weekly open hours, relative to the most available candidate
+    share = c.store.open_share(c.positions)
+    best = share.max() if len(share) else 0.0
+    return share / best if best > 0 else share
+
+
+def _locality(c):
+    # 1.0 in the typed area, 0.5 where one area lies in the other
+    # ("dwarka" / "dwarka sector 6", either way round), else 0;
+    # "sector 1" is not in "sector 12". Scored per area code, then
+    # looked up for every candidate.
+    words = c.locality.split()
+    if not words:
+        return np.zeros(len(c.positions))
+
+    area = " ".join(words)
+    outer = [" ".join(words[:i]) for i in range(1, len(words))]
+    store = c.store
+    by_code = np.zeros(len(store.values["area"]))
+    for s in c.specialities:
+        lo, hi = store.locality_range(s, area + " ")
+        by_code[store.area_code[lo:hi]] = 0.5
+        for name, value in [(name, 0.5) for name in outer] + [(area, 1.0)]:
+            lo, hi = store.area_range(s, name)
+            if hi > lo:
+                by_code[store.area_code[lo]] = value
+    return by_code[store.area_code[c.positions]]
+
+
+CRITERIA = {
+    "distance": _distance,
+    "rating": _rating,
+    "fees": _fees,
+    "availability": _availability,
+    "locality": _locality
+}
+
+# name -> {criterion: weight}, or None for the lexicographic order
+RANKING_PROFILES = {
+    "rating": None,
+    "balanced": {"rating": 0.4, "distance": 0.3, "fees": 0.15, "availability": 0.1, "locality": 0.05},
+    "nearest": {"distance": 0.6, "rating": 0.3, "availability": 0.1},
+    "budget": {"fees": 0.5, "rating": 0.3, "distance": 0.2},
+    "most_available": {"availability": 0.5, "rating": 0.3, "distance": 0.2}
+}
+DEFAULT_RANKING = "rating"
+
+
+def register_profile(name, weights):
+    """
+    Add or replace a ranking profile; weights are over CRITERIA
+    """
+    unknown = set(weights) - set(CRITERIA)
+    if unknown:
+        raise ValueError(f"Unknown ranking criteria: {sorted(unknown)}")
+    RANKING_PROFILES[name] = dict(weights)
+
+
+def check_profile(name):
+    if name not in RANKING_PROFILES:
+        raise ValueError(f"Unknown ranking profile: {name!r} (expected one of {list(RANKING_PROFILES)})")
+    return name
+
+
+def score(candidates, weights):
+    total = np.zeros(len(candidates.positions))
+    for name, weight in weights.items():
+        if weight:
+            total += weight * CRITERIA[name](candidates)
+    return total
+
+
+def top_k_order(key, distance, k):
+    """
+    Indices of the best `k` rows by (key desc, distance asc),
+    ties kept in input order. Only the candidate rows are sorted.
+    """
+    n = len(key)
+    if k >= n:
+        return np.lexsort((distance, -key))
+
+    # everyone with a key at least the k-th best is a candidate
+    neg = -key
+    kth = np.partition(neg, k - 1)[k - 1]
+    better = np.flatnonzero(neg < kth)
+    tied = np.flatnonzero(neg == kth)
+
+    # many ties on the boundary key: keep only the nearest of them
+    need = k - len(better)
+    if len(tied) > need:
+        d = distance[tied]
+        dkth = np.partition(d, need - 1)[need - 1]
+        tied = tied[d <= dkth]
+
+    selected = np.sort(np.concatenate([better, tied]))
+    order = np.lexsort((distance[selected], neg[selected]))
+    return selected[order[:k]]
+
+
+def rank(candidates, profile=DEFAULT_RANKING, k=None):
+    """
+    (order, scores): candidate indices best first (all, or the best `k`)
+    and the weighted scores (None for the "rating" profile)
+    """
+    weights = RANKING_PROFILES[check_profile(profile)]
+    scores = score(candidates, weights) if weights is not None else None
+    key = scores if scores is not None else candidates.store.rating[candidates.positions]
+
+    if k is None:
+        return np.lexsort((candidates.distance_km, -key)), scores
+    return top_k_order(key, candidates.distance_km, k), scores
@@ -1,23 +1,103 @@
+import time
+import threading
+from datetime import datetime
+import numpy as np
 import pandas as pd
-from predict_specialist import predict_specialist
-from distance_utils import get_distance_km
+from predict_specialist import predict_specialist_scored
+from doctor_store import DoctorStore, normalize_doctor_df, load_cached_store
+from lazy_resource import LazyResource
+from gazetteer import Gazetteer, gazetteer
+from result_cache import recommend_cache
+from availability import week_slot
+from ranking import Candidates, rank, check_profile, DEFAULT_RANKING
+from metrics import stage_seconds, radius_used, empty_results
+
+DOCTOR_CSV = "data/clean_doctor_dataset.csv"
+
+# Prefer data/clean_doctor_dataset.store/ (written by preprocess_doctors.py)
+USE_BINARY_STORE = True
 
 # =========================
-# Load cleaned dataset
+# Load cleaned dataset (on first use)
 # =========================
-doctor_df = pd.read_csv("data/clean_doctor_dataset.csv")
+def load_doctor_data(csv_path=DOCTOR_CSV):
+    """
+    Returns the DoctorStore for the cleaned dataset
+    """
+    # Memory-mapped binary copy from preprocess_doctors.py, if up to date
+    if USE_BINARY_STORE:
+        store = load_cached_store(csv_path)
+        if store is not None:
+            return store
+
+    doctor_df = normalize_doctor_df(pd.read_csv(csv_path))
+
+    # Columnar store + per-speciality spatial index (built once at load time)
+    return DoctorStore(doctor_df)
+
+
+doctor_data = LazyResource("doctor_index", load_doctor_data)
+
+
+def get_doctor_df():
+    return doctor_data.get().to_frame()
+
+
+_reload_lock = threading.Lock()
+
+
+def reload_doctor_data(csv_path=DOCTOR_CSV):
+    """
+    Re-read the dataset, rebuild the locality gazetteer from it (unless
+    no area, address or coordinate changed) and drop cached /recommend
+    responses.
+
+    The new store and gazetteer are built next to the live ones and
+    swapped in with single assignments: a request holds the store it
+    started with, so it never sees a half-built directory. If either
+    build fails, nothing is swapped.
+    """
+    with _reload_lock:
+        start = time.perf_counter()
+        previous = doctor_data.value
+
+        store = load_doctor_data(csv_path)
+        localities = None
+        if gazetteer.value is None or not store.same_locations(previous):
+            localities = Gazetteer.from_csv(csv_path)
 
-# Normalize column names
-doctor_df.columns = (
-    doctor_df.columns
-    .str.strip()
-    .str.lower()
-    .str.replace(" ", "_")
-)
+        doctor_data.set(store)
+        if localities is not None:
+            gazetteer.set(localities)
+        recommend_cache.clear()
+
+        return {
+            "rows": store.n_rows,
+            "previous_rows": previous.n_rows if previous is not None else None,
+            "localities": len(gazetteer.value),
+            "gazetteer_rebuilt": localities is not None,
+            "reload_ms": round((time.perf_counter() - start) * 1000, 1)
+        }
+
+
+DISTANCE_LEVELS = [3, 5, 10]
+
+
+def smallest_radius(distances, max_distance_km):
+    """
+    Smallest DISTANCE_LEVELS radius (>= max_distance_km) that contains
+    at least one of `distances`, or None.
+    """
+    if len(distances) == 0:
+        return None
+
+    nearest = distances.min()
+    for radius in DISTANCE_LEVELS:
+        if radius >= max_distance_km and nearest <= radius:
+            return radius
+
+    return None
 
-# Normalize text columns once
-doctor_df["area"] = doctor_df["area"].astype(str).str.lower().str.strip()
-doctor_df["speciality"] = doctor_df["speciality"].astype(str).str.lower().str.strip()
 
 # =========================
 # Recommendation Engine
@@ -29,12 +109,30 @@ def recommend_doctors(
     location_text: str,
     max_distance_km: int,
     max_fees: int,
-    min_rating: float
+    min_rating: float,
+    specialist=None,
+    limit: int = None,
+    offset: int = 0,
+    open_at: datetime = None,
+    ranking: str = DEFAULT_RANKING
 ):
+    """
+    Matching doctors, best first. With `limit`, only the page
+    [offset, offset + limit) is built; the full match count is in
+    `result.attrs["total_matches"]`. With `open_at`, only doctors whose
+    schedule is open at that time (see availability.py).
+    `specialist` may be a shortlist of specialities, searched together.
+    `ranking` names a profile in ranking.RANKING_PROFILES.
+    """
+    check_profile(ranking)
+
     # -------------------------------------------------
     # 1️⃣ Predict specialist (robust)
     # -------------------------------------------------
-    specialist = predict_specialist(symptoms_text).lower()
+    # (skipped when the caller already predicted it)
+    if specialist is None:
+        specialist = predict_specialist_scored(symptoms_text).candidates
+    specialists = [specialist] if isinstance(specialist, str) else specialist
 
     SPECIALITY_MAP = {
         "orthopedics": ["orthopedics", "orthopaedics", "ortho"],
@@ -44,70 +142,87 @@ def recommend_doctors(
         "general medicine": ["general medicine", "physician", "general"]
     }
 
-    allowed_specialities = SPECIALITY_MAP.get(specialist, [specialist])
+    store = doctor_data.get()
 
-    df_specialist = doctor_df[
-        doctor_df["speciality"].isin(allowed_specialities)
-    ].copy()
+    # a low-confidence shortlist is one query over all its specialities
+    allowed_specialities = []
+    for name in specialists:
+        for s in SPECIALITY_MAP.get(name.lower(), [name.lower()]):
+            if s in store.slices and s not in allowed_specialities:
+                allowed_specialities.append(s)
 
-    if df_specialist.empty:
+    if not allowed_specialities:
+        empty_results.inc("unknown_speciality")
         return pd.DataFrame()
 
     # -------------------------------------------------
     # 2️⃣ STRICT LOCALITY FILTER (USER EXPECTATION 🔥)
     # -------------------------------------------------
-    user_area = location_text.lower().split(",")[0].strip()
+    with stage_seconds.time("locality"):
+        user_area = location_text.lower().split(",")[0].strip()
 
-    locality_df = df_specialist[
-        df_specialist["area"].str.startswith(user_area)
-    ].copy()
+        ranges = {s: store.locality_range(s, user_area) for s in allowed_specialities}
 
-    # 👉 If locality match exists, use ONLY that
-    if not locality_df.empty:
-        df_base = locality_df
-        locality_used = True
-    else:
-        # fallback to all specialists (distance-based)
-        df_base = df_specialist
-        locality_used = False
+        # 👉 If locality match exists, use ONLY that
+        # (otherwise fallback to all specialists, distance-based)
+        locality_used = any(hi > lo for lo, hi in ranges.values())
 
     # -------------------------------------------------
-    # 3️⃣ Distance calculation (Haversine)
+    # 3️⃣ Distance calculation (spatial index + Haversine)
     # -------------------------------------------------
-    df_base["distance_km"] = df_base.apply(
-        lambda row: get_distance_km(
+    if max_distance_km > max(DISTANCE_LEVELS):
+        empty_results.inc("distance_out_of_range")
+        return pd.DataFrame()
+
+    with stage_seconds.time("distance"):
+        base_pos, distances = store.query_radius(
+            allowed_specialities,
             patient_lat,
             patient_lng,
-            row["latitude"],
-            row["longitude"]
-        ),
-        axis=1
-    )
+            max(DISTANCE_LEVELS),
+            ranges=ranges if locality_used else None
+        )
 
     # -------------------------------------------------
     # 4️⃣ Distance-based filtering (auto-expand)
     # -------------------------------------------------
-    DISTANCE_LEVELS = [3, 5, 10]
-
-    for radius in DISTANCE_LEVELS:
-        if radius < max_distance_km:
-            continue
-
-        df = df_base[
-            (df_base["distance_km"] <= radius) &
-            (df_base["fees"] <= max_fees) &
-            (df_base["rating"] >= min_rating)
-        ].copy()
-
-        if not df.empty:
-            df["used_radius_km"] = radius
-            df["match_type"] = "locality" if locality_used else "distance"
-            return df.sort_values(
-                by=["rating", "distance_km"],
-                ascending=[False, True]
+    with stage_seconds.time("radius"):
+        ok = (
+            (store.fees[base_pos] <= max_fees) &
+            (store.rating[base_pos] >= min_rating)
+        )
+        if open_at is not None:
+            ok &= store.open_mask(base_pos, week_slot(open_at))
+
+        radius = smallest_radius(distances[ok], max_distance_km)
+
+    radius_used.inc(str(radius) if radius is not None else "none")
+
+    if radius is not None:
+        keep = ok & (distances <= radius)
+        pos, dist = base_pos[keep], distances[keep]
+
+        # "rating": rating desc, then distance asc (stable, like
+        # sort_values); other profiles: weighted score desc
+        with stage_seconds.time("sort"):
+            candidates = Candidates(store, pos, dist, radius, max_fees, user_area, allowed_specialities)
+            order, scores = rank(candidates, ranking, None if limit is None else offset + limit)
+            order = order[offset:]
+
+        with stage_seconds.time("materialize"):
+            extra = {"score": np.round(scores[order], 4)} if scores is not None else {}
+            df = store.materialize(
+                pos[order],
+                distance_km=dist[order],
+                used_radius_km=radius,
+                match_type="locality" if locality_used else "distance",
+                **extra
             )
+        df.attrs["total_matches"] = len(pos)
+        return df
 
     # -------------------------------------------------
     # 5️⃣ Nothing found
     # -------------------------------------------------
+    empty_results.inc("no_match")
     return pd.DataFrame()
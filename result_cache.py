@@ -0,0 +1,81 @@
+import time
+import threading
+from ttl_cache import TTLCache
+
+# =========================
+# /recommend response cache
+# =========================
+# Keyed on the *predicted* specialist(s) (not the symptom text), the patient
+# point rounded to a ~100 m cell, the typed locality, the slider values,
+# the ranking profile and the requested page.
+# Cleared whenever the doctor dataset is reloaded.
+
+RESULT_CACHE_SIZE = 4096
+RESULT_CACHE_TTL = 600            # seconds
+CELL_DECIMALS = 3                 # 0.001° ≈ 110 m
+
+
+def make_key(specialist, lat, lng, location_text, max_distance_km, max_fees, min_rating,
+             limit=None, offset=0, open_slot=None, ranking=None):
+    # the strict locality filter depends on the typed area, so it is part of the key
+    user_area = location_text.lower().split(",")[0].strip()
+    specialists = [specialist] if isinstance(specialist, str) else specialist
+    return (
+        tuple(sorted({s.lower() for s in specialists})),
+        round(lat, CELL_DECIMALS),
+        round(lng, CELL_DECIMALS),
+        user_area,
+        max_distance_km,
+        max_fees,
+        min_rating,
+        limit,
+        offset,
+        open_slot,     # 15-minute week slot of open_at / open_now, or None
+        ranking
+    )
+
+
+class ResultCache(TTLCache):
+    """
+    TTLCache that also tracks request latency on hits vs misses
+    """
+
+    def __init__(self, maxsize=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self._latency = {"hit": [0, 0.0], "miss": [0, 0.0]}   # count, total seconds
+        self._latency_lock = threading.Lock()
+        self.generation = 0    # bumped on clear()
+
+    def set(self, key, value, generation=None):
+        """
+        `generation`: value of `self.generation` when the work started;
+        results computed against a dataset that has since been
+        replaced are dropped instead of cached.
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+
+    def record_latency(self, hit, seconds):
+        with self._latency_lock:
+            bucket = self._latency["hit" if hit else "miss"]
+            bucket[0] += 1
+            bucket[1] += seconds
+
+    def stats(self):
+        stats = super().stats()
+        for name, (count, total) in self._latency.items():
+            stats[f"avg_{name}_ms"] = round(total / count * 1000, 3) if count else None
+        return stats
+
+
+recommend_cache = ResultCache()
@@ -0,0 +1,98 @@
+import math
+import numpy as np
+from distance_utils import R, get_distances_km
+
+# =========================
+# Grid spatial index (radius queries)
+# =========================
+KM_PER_DEG = math.pi * R / 180   # ~111.19 km per degree of latitude
+DEFAULT_CELL_KM = 1.0
+
+
+class GridIndex:
+    """
+    Fixed lat/lng grid over a set of points.
+
+    Points are sorted by cell id once at build time; a radius query
+    only touches the cells overlapping the query's bounding box and
+    then applies the exact (rounded) Haversine, so results are identical
+    to a full scan with `get_distances_km(...) <= radius_km`.
+    """
+
+    def __init__(self, lats, lngs, cell_km=DEFAULT_CELL_KM, order=None, sorted_cells=None):
+        """
+        `order` / `sorted_cells` from a previous build over the same
+        points (e.g. a saved DoctorStore) skip the sort.
+        """
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lngs = np.asarray(lngs, dtype=np.float64)
+        self.step = cell_km / KM_PER_DEG
+
+        n = len(self.lats)
+        self.lat0 = self.lats.min() if n else 0.0
+        self.lng0 = self.lngs.min() if n else 0.0
+        self.n_rows = int((self.lats.max() - self.lat0) // self.step) + 1 if n else 1
+        self.n_cols = int((self.lngs.max() - self.lng0) // self.step) + 1 if n else 1
+
+        if order is None:
+            cell_ids = self._cell_row(self.lats) * self.n_cols + self._cell_col(self.lngs)
+            order = np.argsort(cell_ids, kind="stable")
+            sorted_cells = cell_ids[order]
+        self.cell_km = cell_km
+        self.order = order
+        self.sorted_cells = sorted_cells
+
+    def __len__(self):
+        return len(self.lats)
+
+    def _cell_row(self, lats):
+        return ((lats - self.lat0) // self.step).astype(np.int64)
+
+    def _cell_col(self, lngs):
+        return ((lngs - self.lng0) // self.step).astype(np.int64)
+
+    def candidates(self, lat, lng, radius_km):
+        """
+        Point positions inside the cells covering the bounding box
+        of the circle (superset of the true result).
+        """
+        if not len(self):
+            return np.empty(0, dtype=np.int64)
+
+        # pad by the 2-decimal rounding used on distances
+        delta = (radius_km + 0.01) / R
+        dlat = math.degrees(delta)
+
+        if abs(lat) + dlat >= 90:
+            dlng = 180.0
+        else:
+            dlng = math.degrees(math.asin(min(1.0, math.sin(delta) / math.cos(math.radians(lat)))))
+
+        row_lo = max(int((lat - dlat - self.lat0) // self.step), 0)
+        row_hi = min(int((lat + dlat - self.lat0) // self.step), self.n_rows - 1)
+        col_lo = max(int((lng - dlng - self.lng0) // self.step), 0)
+        col_hi = min(int((lng + dlng - self.lng0) // self.step), self.n_cols - 1)
+
+        if row_lo > row_hi or col_lo > col_hi:
+            return np.empty(0, dtype=np.int64)
+
+        # each grid row is one contiguous run of cell ids
+        rows = np.arange(row_lo, row_hi + 1, dtype=np.int64)
+        starts = np.searchsorted(self.sorted_cells, rows * self.n_cols + col_lo, side="left")
+        ends = np.searchsorted(self.sorted_cells, rows * self.n_cols + col_hi, side="right")
+
+        chunks = [self.order[s:e] for s, e in zip(starts, ends) if e > s]
+        if not chunks:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(chunks)
+
+    def query_radius(self, lat, lng, radius_km):
+        """
+        All points within `radius_km` of (lat, lng).
+        Returns (positions, distances_km), positions in ascending order.
+        """
+        pos = np.sort(self.candidates(lat, lng, radius_km))
+        dist = get_distances_km(lat, lng, self.lats[pos], self.lngs[pos])
+
+        keep = dist <= radius_km
+        return pos[keep], dist[keep]
@@ -0,0 +1,69 @@
+import re
+import json
+from collections import namedtuple
+
+# =========================
+# Keyword rule table
+# =========================
+# Rules live in RULES_FILE, highest priority first. Keywords are single
+# words, so at load time every keyword + suffix form goes into one
+# word -> (priority, keyword) table; matching a text is one split into
+# words and one set intersection, no matter how many keywords there are.
+
+RULES_FILE = "data/specialist_rules.json"
+
+RuleMatch = namedtuple("RuleMatch", ["specialist", "keyword", "priority"])
+
+# word separators are any non-alphanumeric, so "chest_pain" still matches "chest"
+_SEPARATOR_RE = re.compile(r"[\W_]+")
+
+
+class RuleTable:
+    """
+    Whole-word keyword matcher: "cold" / "colds" / "cold_hands" match,
+    "scold" does not.
+    """
+
+    def __init__(self, rules, suffixes=()):
+        self.specialists = [r["specialist"] for r in rules]
+
+        self.forms = {}
+        for priority, rule in enumerate(rules):
+            for keyword in rule["keywords"]:
+                keyword = keyword.lower()
+                if _SEPARATOR_RE.search(keyword):
+                    raise ValueError(f"Rule keywords must be single words: {keyword!r}")
+                for suffix in ("", *suffixes):
+                    # a form claimed by an earlier rule keeps its priority
+                    self.forms.setdefault(keyword + suffix, (priority, keyword))
+        self._form_set = frozenset(self.forms)
+
+    @classmethod
+    def from_file(cls, path=RULES_FILE):
+        with open(path) as f:
+            config = json.load(f)
+        return cls(config["rules"], config.get("suffixes", ()))
+
+    def match(self, text: str):
+        """
+        Highest-priority RuleMatch in lowercased `text`, or None
+        """
+        return self.match_words(_SEPARATOR_RE.split(text))
+
+    def match_words(self, words):
+        """
+        `match` for a text already split into words (e.g.
+        normalize_symptoms(text).split(), which skips the regex split)
+        """
+        hits = self._form_set.intersection(words)
+        if not hits:
+            return None
+        priority, keyword = min(self.forms[w] for w in hits)
+        return RuleMatch(self.specialists[priority], keyword, priority)
+
+
+rule_table = RuleTable.from_file()
+
+
+def match_rule(text: str):
+    return rule_table.match(text)
@@ -0,0 +1,117 @@
+import json
+from collections import Counter
+import numpy as np
+
+# =========================
+# Character n-gram TF-IDF + linear classifier (inference)
+# =========================
+# Trained by train_tfidf.py with scikit-learn; served here with plain
+# NumPy. sklearn's transform() costs ~1 ms per text in input validation
+# and sparse-matrix setup, this path is a dict lookup per n-gram and one
+# small matrix product.
+
+NGRAM_RANGE = (2, 4)
+
+
+def char_ngrams(text, ngram_range=NGRAM_RANGE):
+    """
+    Character n-grams inside word boundaries (sklearn's "char_wb"):
+    each word is padded with one space, words shorter than n give
+    themselves once
+    """
+    min_n, max_n = ngram_range
+    ngrams = []
+    for word in text.split():
+        word = " " + word + " "
+        for n in range(min_n, max_n + 1):
+            if len(word) <= n:
+                ngrams.append(word)
+                break
+            ngrams.extend(word[i:i + n] for i in range(len(word) - n + 1))
+    return ngrams
+
+
+class TfidfClassifier:
+    """
+    Sublinear TF-IDF features (l2-normalized) -> softmax over
+    `coef` (n_features x n_classes) + `intercept`
+    """
+
+    def __init__(self, terms, idf, coef, intercept, labels, ngram_range=NGRAM_RANGE):
+        self.terms = list(terms)
+        self.vocabulary = {t: i for i, t in enumerate(self.terms)}
+        self.idf = np.asarray(idf, dtype=np.float32)
+        self.coef = np.ascontiguousarray(coef, dtype=np.float32)
+        self.intercept = np.asarray(intercept, dtype=np.float32)
+        self.labels = [str(label) for label in labels]
+        self.ngram_range = tuple(ngram_range)
+
+    @classmethod
+    def from_sklearn(cls, vectorizer, classifier, ngram_range=NGRAM_RANGE):
+        """
+        From a fitted TfidfVectorizer(analyzer=char_ngrams, sublinear_tf=True)
+        and a fitted multinomial LogisticRegression
+        """
+        terms = vectorizer.get_feature_names_out()
+        return cls(
+            terms,
+            vectorizer.idf_,
+            classifier.coef_.T,
+            classifier.intercept_,
+            classifier.classes_,
+            ngram_range
+        )
+
+    def features(self, text):
+        """
+        (feature ids, tf-idf weights) of one text
+        """
+        counts = Counter(char_ngrams(text, self.ngram_range))
+        ids, tf = [], []
+        for gram, n in counts.items():
+            i = self.vocabulary.get(gram)
+            if i is not None:
+                ids.append(i)
+                tf.append(n)
+
+        ids = np.array(ids, dtype=np.intp)
+        weights = (1.0 + np.log(np.array(tf, dtype=np.float32))) * self.idf[ids]
+        norm = np.sqrt(np.dot(weights, weights))
+        return ids, weights / norm if norm > 0 else weights
+
+    def predict_proba(self, texts):
+        """
+        Softmax class probabilities, one row per text
+        """
+        logits = np.empty((len(texts), len(self.labels)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            ids, weights = self.features(text)
+            logits[row] = weights @ self.coef[ids] + self.intercept
+
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def save(self, path):
+        meta = {"labels": self.labels, "ngram_range": list(self.ngram_range)}
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                terms=np.array(self.terms),
+                idf=self.idf,
+                coef=self.coef,
+                intercept=self.intercept,
+                meta=np.array(json.dumps(meta))
+            )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            return cls(
+                data["terms"].tolist(),
+                data["idf"],
+                data["coef"],
+                data["intercept"],
+                meta["labels"],
+                meta["ngram_range"]
+            )
@@ -1,91 +1,223 @@
-import pandas as pd
+import os
 import json
+import time
+import argparse
+import numpy as np
+import pandas as pd
 from sklearn.model_selection import train_test_split
+from sklearn.metrics import f1_score
 from transformers import (
     DistilBertTokenizerFast,
     DistilBertForSequenceClassification,
+    DataCollatorWithPadding,
     Trainer,
+    TrainerCallback,
     TrainingArguments
 )
 import torch
-
-# 1️⃣ Load dataset
-df = pd.read_csv("data/final_symptom_speciality_dataset.csv")
-
-# 2️⃣ Encode labels
-label_map = {label: idx for idx, label in enumerate(df["Speciality"].unique())}
-df["label"] = df["Speciality"].map(label_map)
-
-# Save label map (IMPORTANT for inference)
-with open("model/label_map.json", "w") as f:
-    json.dump(label_map, f)
-
-# 3️⃣ Train-test split
-train_texts, val_texts, train_labels, val_labels = train_test_split(
-    df["text"].tolist(),
-    df["label"].tolist(),
-    test_size=0.2,
-    random_state=42,
-    stratify=df["label"]
-)
-
-# 4️⃣ Tokenizer
-tokenizer = DistilBertTokenizerFast.from_pretrained(
-    "distilbert-base-uncased"
-)
-
-train_enc = tokenizer(train_texts, truncation=True, padding=True)
-val_enc = tokenizer(val_texts, truncation=True, padding=True)
-
-# 5️⃣ Dataset class
+from predict_specialist import normalize_symptoms, MAX_LENGTH
+
+# =========================
+# CONFIG
+# =========================
+DATASET = "data/final_symptom_speciality_dataset.csv"
+BASE_MODEL = "distilbert-base-uncased"
+OUTPUT_DIR = "model"
+
+EPOCHS = 3
+BATCH_SIZE = 8
+CPU_THREADS = None          # torch intra-op threads, None = torch default
+CLASS_WEIGHTING = True      # General Medicine is ~80% of the rows
+SEED = 42
+
+
+# 1️⃣ Load dataset + encode labels
+def load_dataset(path=DATASET):
+    """
+    (texts, labels, label_map); texts normalized the way
+    predict_specialist normalizes them at serving time
+    """
+    df = pd.read_csv(path)
+    label_map = {label: idx for idx, label in enumerate(df["Speciality"].unique())}
+
+    texts = [normalize_symptoms(t) for t in df["text"]]
+    labels = df["Speciality"].map(label_map).tolist()
+    return texts, labels, label_map
+
+
+# 2️⃣ Train-test split
+def split(texts, labels):
+    return train_test_split(
+        texts,
+        labels,
+        test_size=0.2,
+        random_state=42,
+        stratify=labels
+    )
+
+
+# 3️⃣ Dataset: tokenized once, unpadded
 class SymptomDataset(torch.utils.data.Dataset):
-    def __init__(self, encodings, labels):
-        self.encodings = encodings
-        self.labels = labels
+    """
+    Each text is tokenized (and truncated to `max_length`) once, into
+    tensors; batches are padded to their own longest row by the collator.
+    """
+
+    def __init__(self, tokenizer, texts, labels, max_length=MAX_LENGTH):
+        encodings = tokenizer(texts, truncation=True, max_length=max_length)
+        self.items = [
+            {
+                "input_ids": torch.tensor(ids),
+                "attention_mask": torch.tensor(mask),
+                "labels": torch.tensor(label)
+            }
+            for ids, mask, label in zip(encodings["input_ids"], encodings["attention_mask"], labels)
+        ]
 
     def __getitem__(self, idx):
-        item = {k: torch.tensor(v[idx]) for k, v in self.encodings.items()}
-        item["labels"] = torch.tensor(self.labels[idx])
-        return item
+        return self.items[idx]
 
     def __len__(self):
-        return len(self.labels)
-
-train_dataset = SymptomDataset(train_enc, train_labels)
-val_dataset = SymptomDataset(val_enc, val_labels)
-
-# 6️⃣ Model
-model = DistilBertForSequenceClassification.from_pretrained(
-    "distilbert-base-uncased",
-    num_labels=len(label_map)
-)
-
-# 7️⃣ Training arguments
-training_args = TrainingArguments(
-    output_dir="model",
-    eval_strategy="epoch",
-    per_device_train_batch_size=8,
-    per_device_eval_batch_size=8,
-    num_train_epochs=3,
-    logging_dir="logs",
-    save_total_limit=1,
-    report_to="none"
-)
-
-# 8️⃣ Trainer
-trainer = Trainer(
-    model=model,
-    args=training_args,
-    train_dataset=train_dataset,
-    eval_dataset=val_dataset,
-    tokenizer=tokenizer
-)
-
-# 9️⃣ Train
-trainer.train()
-
-# 🔟 Save model
-model.save_pretrained("model")
-tokenizer.save_pretrained("model")
-
-print("✅ Model training completed and saved.")
+        return len(self.items)
+
+
+# 4️⃣ Class-balanced loss
+def class_weights(labels, n_classes):
+    """
+    n / (n_classes * count) per class, like sklearn's "balanced"
+    """
+    counts = np.bincount(labels, minlength=n_classes).astype(np.float32)
+    weights = len(labels) / (n_classes * np.maximum(counts, 1))
+    return torch.tensor(weights)
+
+
+def weighted_loss(weights):
+    loss_fn = torch.nn.CrossEntropyLoss(weight=weights)
+
+    def compute_loss(outputs, labels, num_items_in_batch=None):
+        return loss_fn(outputs.logits, labels)
+
+    return compute_loss
+
+
+# 5️⃣ Metrics: per-class F1 + seconds per epoch
+def f1_metrics(label_names):
+    def compute_metrics(eval_pred):
+        predicted = np.argmax(eval_pred.predictions, axis=1)
+        labels = eval_pred.label_ids
+        per_class = f1_score(labels, predicted, labels=range(len(label_names)), average=None, zero_division=0)
+
+        return {
+            "accuracy": float((predicted == labels).mean()),
+            "macro_f1": float(per_class.mean()),
+            **{f"f1_{name}": float(f) for name, f in zip(label_names, per_class)}
+        }
+
+    return compute_metrics
+
+
+class EpochTimer(TrainerCallback):
+    def __init__(self):
+        self.seconds = []
+        self._start = None
+
+    def on_epoch_begin(self, args, state, control, **kwargs):
+        self._start = time.perf_counter()
+
+    def on_epoch_end(self, args, state, control, **kwargs):
+        self.seconds.append(time.perf_counter() - self._start)
+
+
+# 6️⃣ Trainer
+def build_trainer(model, tokenizer, train_dataset, val_dataset, label_names,
+                  output_dir=OUTPUT_DIR, epochs=EPOCHS, batch_size=BATCH_SIZE,
+                  group_by_length=True, class_weighting=CLASS_WEIGHTING, seed=SEED):
+    """
+    Trainer with dynamic padding, length-grouped batches (similar
+    lengths share a batch, so little padding) and optionally a
+    class-weighted loss. Returns (trainer, EpochTimer).
+    """
+    training_args = TrainingArguments(
+        output_dir=output_dir,
+        eval_strategy="epoch",
+        per_device_train_batch_size=batch_size,
+        per_device_eval_batch_size=batch_size * 4,
+        num_train_epochs=epochs,
+        train_sampling_strategy="group_by_length" if group_by_length else "random",
+        save_strategy="no",
+        seed=seed,
+        use_cpu=not torch.cuda.is_available(),
+        report_to="none"
+    )
+
+    loss_func = None
+    if class_weighting:
+        train_labels = [int(item["labels"]) for item in train_dataset.items]
+        loss_func = weighted_loss(class_weights(train_labels, len(label_names)))
+
+    timer = EpochTimer()
+    trainer = Trainer(
+        model=model,
+        args=training_args,
+        train_dataset=train_dataset,
+        eval_dataset=val_dataset,
+        processing_class=tokenizer,
+        data_collator=DataCollatorWithPadding(tokenizer),
+        compute_loss_func=loss_func,
+        compute_metrics=f1_metrics(label_names),
+        callbacks=[timer]
+    )
+    return trainer, timer
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-length", type=int, default=MAX_LENGTH, help="tokens per text")
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--threads", type=int, default=CPU_THREADS, help="torch CPU threads")
+    parser.add_argument("--no-class-weights", action="store_true")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    texts, labels, label_map = load_dataset()
+    label_names = list(label_map)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    # Save label map (IMPORTANT for inference)
+    with open(os.path.join(args.output_dir, "label_map.json"), "w") as f:
+        json.dump(label_map, f)
+
+    train_texts, val_texts, train_labels, val_labels = split(texts, labels)
+
+    tokenizer = DistilBertTokenizerFast.from_pretrained(BASE_MODEL)
+    train_dataset = SymptomDataset(tokenizer, train_texts, train_labels, args.max_length)
+    val_dataset = SymptomDataset(tokenizer, val_texts, val_labels, args.max_length)
+
+    model = DistilBertForSequenceClassification.from_pretrained(
+        BASE_MODEL,
+        num_labels=len(label_map)
+    )
+
+    trainer, timer = build_trainer(
+        model, tokenizer, train_dataset, val_dataset, label_names,
+        output_dir=args.output_dir,
+        epochs=args.epochs,
+        batch_size=args.batch_size,
+        class_weighting=not args.no_class_weights
+    )
+
+    # 7️⃣ Train
+    trainer.train()
+    metrics = trainer.evaluate()
+    print("⏱️ seconds per epoch:", [round(s, 1) for s in timer.seconds])
+    print("📊 per-class F1:", {k[len("eval_f1_"):]: round(v, 3) for k, v in metrics.items() if k.startswith("eval_f1_")})
+
+    # 8️⃣ Save model
+    model.save_pretrained(args.output_dir)
+    tokenizer.save_pretrained(args.output_dir)
+
+    print("✅ Model training completed and saved.")
@@ -0,0 +1,123 @@
+import os
+import json
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score, classification_report
+from tfidf_classifier import TfidfClassifier, char_ngrams
+from predict_specialist import normalize_symptoms, predict_by_rules, TFIDF_MODEL_PATH, TFIDF_MIN_CONFIDENCE
+
+# =========================
+# Train the TF-IDF tier of predict_specialist
+# =========================
+#   python train_tfidf.py
+# Same data and validation split as train.py. Writes TFIDF_MODEL_PATH
+# and a report (accuracy, latency, escalation rate per confidence
+# threshold) next to it as report.json.
+
+DATASET = "data/final_symptom_speciality_dataset.csv"
+THRESHOLDS = [0.5, 0.6, 0.7, 0.8, 0.9]
+
+
+def split():
+    df = pd.read_csv(DATASET)
+    return train_test_split(
+        [normalize_symptoms(t) for t in df["text"]],
+        df["Speciality"].tolist(),
+        test_size=0.2,
+        random_state=42,
+        stratify=df["Speciality"]
+    )
+
+
+def train(texts, labels, C=10.0):
+    vectorizer = TfidfVectorizer(
+        analyzer=char_ngrams,
+        sublinear_tf=True,
+        min_df=2,
+        dtype=np.float32
+    )
+    X = vectorizer.fit_transform(texts)
+
+    # General Medicine is ~80% of the rows
+    classifier = LogisticRegression(C=C, max_iter=2000, class_weight="balanced")
+    classifier.fit(X, labels)
+    return TfidfClassifier.from_sklearn(vectorizer, classifier)
+
+
+def latency_ms(model, texts):
+    samples = []
+    for text in texts:
+        start = time.perf_counter()
+        model.predict_proba([text])
+        samples.append(time.perf_counter() - start)
+    return {
+        "p50": round(float(np.percentile(samples, 50)) * 1000, 4),
+        "p99": round(float(np.percentile(samples, 99)) * 1000, 4)
+    }
+
+
+def evaluate(model, texts, labels):
+    probs = model.predict_proba(texts)
+    predicted = np.array(model.labels)[probs.argmax(axis=1)]
+    confidence = probs.max(axis=1)
+    labels = np.array(labels)
+
+    by_threshold = {}
+    for threshold in THRESHOLDS:
+        answered = confidence >= threshold
+        by_threshold[str(threshold)] = {
+            "escalation_rate": round(float(1 - answered.mean()), 4),
+            "answered_accuracy": round(float(accuracy_score(labels[answered], predicted[answered])), 4)
+            if answered.any() else None
+        }
+
+    return {
+        "n": len(texts),
+        "accuracy": round(float(accuracy_score(labels, predicted)), 4),
+        "macro_f1": round(float(f1_score(labels, predicted, average="macro")), 4),
+        "thresholds": by_threshold
+    }, predicted
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--out", default=TFIDF_MODEL_PATH)
+    parser.add_argument("--C", type=float, default=10.0)
+    args = parser.parse_args()
+
+    train_texts, val_texts, train_labels, val_labels = split()
+
+    start = time.perf_counter()
+    model = train(train_texts, train_labels, C=args.C)
+    train_s = time.perf_counter() - start
+
+    # the tier only sees texts the keyword rules miss
+    rule_misses = [i for i, t in enumerate(val_texts) if predict_by_rules(t) is None]
+
+    overall, predicted = evaluate(model, val_texts, val_labels)
+    misses, _ = evaluate(model, [val_texts[i] for i in rule_misses], [val_labels[i] for i in rule_misses])
+
+    report = {
+        "train_rows": len(train_texts),
+        "features": len(model.terms),
+        "train_seconds": round(train_s, 2),
+        "default_threshold": TFIDF_MIN_CONFIDENCE,
+        "validation": overall,
+        "validation_rule_misses": misses,
+        "latency_ms": latency_ms(model, val_texts[:500]),
+        "latency_ms_short": latency_ms(model, [" ".join(t.split()[:8]) for t in val_texts[:500]])
+    }
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    model.save(args.out)
+    with open(os.path.join(os.path.dirname(args.out), "report.json"), "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(classification_report(val_labels, predicted, zero_division=0))
+    print(json.dumps(report, indent=2))
+    print(f"✅ TF-IDF classifier saved to {args.out}")